@@ -1,3 +1,11 @@
+import sys
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch/table helpers
+    np = None
+
 
 # Recursive method
 def fibonacci_recursive(n):
@@ -15,17 +23,289 @@ def fibonacci_iterative(n):
         a, b = b, a + b
     return series
 
-# Main program
-n = int(input("Enter number of terms: "))
+# Bounded LRU cache used by the memoized methods
+class LRUCache(object):
+    def __init__(self, maxsize=1024):
+        if maxsize < 3:
+            raise ValueError("maxsize must be at least 3")  # F(k) needs F(k-1), F(k-2)
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key):
+        if key in self.data:
+            self.data.move_to_end(key)
+            self.hits += 1
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)  # drop least recently used
+            self.evictions += 1
+
+    def clear(self):
+        self.data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+fib_cache = LRUCache()
+
+# Deepest n evaluated with real recursion before switching to the explicit stack
+MEMO_RECURSION_LIMIT = sys.getrecursionlimit() // 2
+
+# Memoized recursive method
+def fibonacci_memo(n, cache=None):
+    if cache is None:
+        cache = fib_cache
+    if n > MEMO_RECURSION_LIMIT:
+        return fibonacci_memo_stack(n, cache)
+    return _fibonacci_memo(n, cache)
+
+def _fibonacci_memo(n, cache):
+    if n <= 1:
+        return n
+    value = cache.get(n)
+    if value is None:
+        value = _fibonacci_memo(n - 1, cache) + _fibonacci_memo(n - 2, cache)
+        cache.put(n, value)
+    return value
+
+# Memoized method on an explicit stack (same recurrence, no Python recursion)
+def fibonacci_memo_stack(n, cache=None):
+    if cache is None:
+        cache = fib_cache
+    if n <= 1:
+        return n
+    stack = [n]
+    while stack:
+        k = stack[-1]
+        if k in cache:
+            stack.pop()
+            continue
+        a = k - 1 if k - 1 <= 1 else cache.get(k - 1)
+        if a is None:
+            stack.append(k - 1)
+            continue
+        b = k - 2 if k - 2 <= 1 else cache.get(k - 2)
+        if b is None:
+            stack.append(k - 2)
+            continue
+        cache.put(k, a + b)
+        stack.pop()
+    return cache.get(n)
+
+# Fast doubling method (single term in O(log n) multiplications)
+# F(2k)   = F(k) * (2*F(k+1) - F(k))
+# F(2k+1) = F(k)^2 + F(k+1)^2
+def fibonacci_pair(n):
+    # Returns (F(n), F(n+1))
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = 0, 1  # (F(k), F(k+1)) with k = 0
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)  # F(2k)
+        d = a * a + b * b  # F(2k+1)
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+def fibonacci_fast_doubling(n):
+    return fibonacci_pair(n)[0]
+
+# F(n) mod m for a single n (fast doubling with every step reduced mod m)
+def fibonacci_mod(n, m):
+    if n < 0 or m < 1:
+        raise ValueError("n must be >= 0 and m >= 1")
+    a, b = 0, 1 % m
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % m
+        d = (a * a + b * b) % m
+        if bit == "1":
+            a, b = d, (c + d) % m
+        else:
+            a, b = c, d
+    return a
+
+# Pisano periods longer than this are not tabulated (table memory and the
+# one-off scan both grow with the period, which can reach 6m)
+PISANO_TABLE_LIMIT = 10 ** 6
+
+# modulus -> numpy table of F(0..period-1) mod m, or None if period too long
+pisano_cache = {}
+
+def pisano_table(m):
+    if m in pisano_cache:
+        return pisano_cache[m]
+    table = None
+    if m == 1:
+        table = [0]
+    else:
+        values = [0, 1]
+        a, b = 1, 1 % m  # F(1), F(2)
+        while len(values) <= PISANO_TABLE_LIMIT:
+            if a == 0 and b == 1:  # sequence restarted: period found
+                table = values[:-1]
+                break
+            values.append(b)
+            a, b = b, (a + b) % m
+    if table is not None and np is not None:
+        table = np.array(table, dtype=np.int64)
+    pisano_cache[m] = table
+    return table
+
+def pisano_period(m):
+    table = pisano_table(m)
+    return None if table is None else len(table)
+
+# Batched F(n) mod m for an array of n
+# Short Pisano period -> table lookup at n % period; otherwise fast doubling
+# over the whole array with int64 arithmetic (exact for m < 2^31).
+# Returns an array shaped like ns: int64, or object (Python ints) for
+# m >= 2^31, computed term by term. Without numpy, a list.
+def fibonacci_mod_batch(ns, m):
+    if m < 1:
+        raise ValueError("m must be >= 1")
+    if np is None:
+        return [fibonacci_mod(int(n), m) for n in ns]
+    if m >= 2 ** 31:
+        ns = np.asarray(ns)
+        out = np.empty(ns.shape, dtype=object)
+        for i, n in np.ndenumerate(ns):
+            out[i] = fibonacci_mod(int(n), m)
+        return out
+    ns = np.asarray(ns, dtype=np.int64)
+    if ns.size and ns.min() < 0:
+        raise ValueError("n must be non-negative")
+    table = pisano_table(m)
+    if table is not None:
+        return table[ns % len(table)]
+    a = np.zeros(ns.shape, dtype=np.int64)
+    b = np.ones(ns.shape, dtype=np.int64)
+    top = int(ns.max()).bit_length() if ns.size else 0
+    for bit in range(top - 1, -1, -1):
+        c = a * ((2 * b - a) % m) % m
+        d = (a * a + b * b) % m
+        odd = ((ns >> bit) & 1).astype(bool)
+        a = np.where(odd, d, c)
+        b = np.where(odd, (c + d) % m, d)
+    return a
+
+# F(92) is the largest Fibonacci number that fits in a signed int64
+INT64_FIB_LIMIT = 92
+
+# All 93 int64 Fibonacci numbers, built once by doubling over the index array
+_int64_table = None
+
+def int64_fibonacci_table():
+    global _int64_table
+    if _int64_table is None:
+        idx = np.arange(INT64_FIB_LIMIT + 1, dtype=np.int64)
+        a = np.zeros(idx.shape, dtype=np.int64)
+        b = np.ones(idx.shape, dtype=np.int64)
+        for bit in range(INT64_FIB_LIMIT.bit_length() - 1, -1, -1):
+            # Only b can exceed int64 (F(93) on the last step for index 92)
+            # and b is discarded at the end, so a stays exact
+            c = a * (2 * b - a)
+            d = a * a + b * b
+            odd = ((idx >> bit) & 1).astype(bool)
+            a = np.where(odd, d, c)
+            b = np.where(odd, c + d, d)
+        a.flags.writeable = False
+        _int64_table = a
+    return _int64_table
+
+# Table of F(0..n-1) as a contiguous numpy array
+# Sliced from the cached int64 table while F(n-1) fits in int64;
+# longer tables fall back to an object array of Python ints.
+# With path set, the table is written to a .npy file and returned memory-mapped.
+def fibonacci_table(n, path=None):
+    if np is None:
+        raise ImportError("fibonacci_table requires numpy")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if n - 1 <= INT64_FIB_LIMIT:
+        table = int64_fibonacci_table()[:n].copy()
+    else:
+        table = np.empty(n, dtype=object)
+        for i, value in enumerate(fibonacci_stream(0, n)):
+            table[i] = value
+    if path is None:
+        return np.ascontiguousarray(table)
+    if table.dtype == object:
+        raise ValueError("only int64 tables (n <= %d) can be memory-mapped" % (INT64_FIB_LIMIT + 1))
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.int64, shape=table.shape)
+    out[:] = table
+    out.flush()
+    return out
+
+# Reopen a table written by fibonacci_table(n, path) without copying it into memory
+def load_fibonacci_table(path):
+    return np.load(path, mmap_mode="r")
+
+# Streaming method (lazy generator, constant memory)
+# Yields F(start), F(start+step), ... while index < stop (forever if stop is None).
+# state=(a, b) resumes from a saved pair (F(k), F(k+1)); start/stop/step are then
+# counted from k instead of from 0. With with_state=True each item is
+# (F(i), (F(i), F(i+1))): passing that pair back as state with start=step
+# continues right after i.
+# Both the initial skip and steps > 1 jump in O(log) with fibonacci_pair:
+# F(k+j) = F(j)*F(k+1) + F(j-1)*F(k).
+def fibonacci_stream(start=0, stop=None, step=1, state=None, with_state=False):
+    if start < 0 or step < 1:
+        raise ValueError("start must be >= 0 and step >= 1")
+    a, b = (0, 1) if state is None else state
+    if start:
+        a, b = fibonacci_advance(a, b, *fibonacci_pair(start))
+    jump = fibonacci_pair(step)
+    i = start
+    while stop is None or i < stop:
+        yield (a, (a, b)) if with_state else a
+        if step == 1:
+            a, b = b, a + b
+        else:
+            a, b = fibonacci_advance(a, b, *jump)
+        i += step
+
+# (F(k+j), F(k+j+1)) from (F(k), F(k+1)) and (F(j), F(j+1))
+def fibonacci_advance(a, b, fj, fj1):
+    return fj * b + (fj1 - fj) * a, fj1 * b + fj * a
+
+if __name__ == "__main__":
+    # Main program
+    n = int(input("Enter number of terms: "))
+
+    # Print using Iterative
+    print("\nFibonacci Series (Iterative):")
+    print(fibonacci_iterative(n))
 
-# Print using Iterative
-print("\nFibonacci Series (Iterative):")
-print(fibonacci_iterative(n))
+    # Print using Recursive (memoized, so each term reuses the previous two)
+    print("\nFibonacci Series (Recursive):")
+    for i in range(n):
+        print(fibonacci_memo(i), end=" ")
+    print("\nCache stats:", fib_cache.stats())
 
-# Print using Recursive
-print("\nFibonacci Series (Recursive):")
-for i in range(n):
-    print(fibonacci_recursive(i), end=" ")
+    # Print only the nth term using Fast Doubling
+    print("\nF(%d) (Fast Doubling):" % n)
+    print(fibonacci_fast_doubling(n))
 
 
 
@@ -183,6 +463,7 @@ for i in range(n):
 # | --------- | --------------- | ---------------- | ------------------------- |
 # | Recursive | O(2ⁿ)           | O(n)             | Slow for large inputs     |
 # | Iterative | O(n)            | O(1)             | Fast and memory efficient |
+# | Doubling  | O(log n) mults  | O(1)             | Single term F(n) only     |
 
 # ---
 
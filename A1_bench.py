@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+
+from A1 import (
+    fibonacci_recursive,
+    fibonacci_iterative,
+    fibonacci_fast_doubling,
+    fibonacci_mod,
+    fibonacci_mod_batch,
+    pisano_cache,
+)
+
+# Largest n each method is timed at (beyond these the run takes minutes or
+# the full iterative series no longer fits in memory)
+RECURSIVE_LIMIT = 30
+ITERATIVE_LIMIT = 10 ** 4
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_single_term(sizes=(10, 20, 30, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)):
+    print("=== Single term F(n): Recursive vs Iterative vs Fast Doubling ===")
+    print(" %10s | %12s | %12s | %12s" % ("n", "Recursive", "Iterative", "Doubling"))
+    print("-" * 56)
+    for n in sizes:
+        t_fast, expected = time_call(fibonacci_fast_doubling, n)
+        t_rec = t_it = None
+        if n <= RECURSIVE_LIMIT:
+            t_rec, value = time_call(fibonacci_recursive, n)
+            assert value == expected
+        if n <= ITERATIVE_LIMIT:
+            t_it, series = time_call(fibonacci_iterative, n + 1)
+            assert series[-1] == expected
+        print(" %10d | %12s | %12s | %12s" % (n, fmt(t_rec), fmt(t_it), fmt(t_fast)))
+
+
+def bench_mod_batch(queries=10 ** 6, moduli=(1000, 10 ** 4 + 7, 10 ** 9 + 7, 2 ** 61 - 1)):
+    print("\n=== Batched F(n) mod m (n < 10^18) ===")
+    print(" %20s | %10s | %12s | %14s" % ("m", "queries", "time", "queries/s"))
+    print("-" * 66)
+    rng = np.random.default_rng(0)
+    for m in moduli:
+        count = queries if m < 2 ** 31 else queries // 100  # pure-Python path
+        ns = rng.integers(0, 10 ** 18, size=count)
+        pisano_cache.pop(m, None)  # include the one-off period scan
+        elapsed, result = time_call(fibonacci_mod_batch, ns, m)
+        for i in range(0, count, max(1, count // 10)):
+            assert result[i] == fibonacci_mod(int(ns[i]), m)
+        print(" %20d | %10d | %11.4fs | %14.0f" % (m, count, elapsed, count / elapsed))
+
+
+def fmt(seconds):
+    if seconds is None:
+        return "-"
+    return "%.6fs" % seconds
+
+
+if __name__ == "__main__":
+    bench_single_term()
+    bench_mod_batch()
@@ -0,0 +1,136 @@
+import argparse
+import csv
+import inspect
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import A1
+
+
+def memo_series(func):
+    # n terms through one fresh cache, as the main program does
+    def run(n):
+        cache = A1.LRUCache()
+        return [func(i, cache) for i in range(n)]
+    return run
+
+
+# strategy name -> (function computing the first n terms, largest n it is profiled at,
+#                   the A1.py functions whose calls are counted)
+# fast_doubling is the exception: it only computes the single term F(n)
+# Only the Fibonacci functions themselves are counted, not the LRUCache
+# methods, so the call counts compare across strategies.
+STRATEGIES = {
+    "recursive": (lambda n: [A1.fibonacci_recursive(i) for i in range(n)], 25, {"fibonacci_recursive"}),
+    "iterative": (A1.fibonacci_iterative, None, {"fibonacci_iterative"}),
+    "memo": (memo_series(A1.fibonacci_memo), None, {"fibonacci_memo", "_fibonacci_memo", "fibonacci_memo_stack"}),
+    "memo_stack": (memo_series(A1.fibonacci_memo_stack), None, {"fibonacci_memo_stack"}),
+    "stream": (lambda n: list(A1.fibonacci_stream(0, n)), None, {"fibonacci_stream"}),
+    "fast_doubling": (A1.fibonacci_fast_doubling, None, {"fibonacci_fast_doubling", "fibonacci_pair"}),
+}
+
+FIELDS = ["strategy", "n", "calls", "max_depth", "wall_time_s", "peak_bytes", "python"]
+
+
+# Counts calls into the named A1.py functions and the deepest nesting reached
+# A generator counts once when first entered, not on every resume.
+class CallCounter(object):
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.generators = set()
+
+    def __call__(self, frame, event, arg):
+        code = frame.f_code
+        if code.co_filename != A1.__file__ or code.co_name not in self.names:
+            return
+        if event == "call":
+            if code.co_flags & inspect.CO_GENERATOR:
+                if frame in self.generators:
+                    self.depth += 1
+                    return
+                self.generators.add(frame)
+            self.calls += 1
+            self.depth += 1
+            if self.depth > self.max_depth:
+                self.max_depth = self.depth
+        elif event == "return":
+            self.depth -= 1
+
+
+def profile_strategy(name, n):
+    func, _, names = STRATEGIES[name]
+
+    # Wall time without any instrumentation attached
+    start = time.perf_counter()
+    func(n)
+    wall = time.perf_counter() - start
+
+    counter = CallCounter(names)
+    sys.setprofile(counter)
+    try:
+        func(n)
+    finally:
+        sys.setprofile(None)
+
+    tracemalloc.start()
+    try:
+        func(n)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "strategy": name,
+        "n": n,
+        "calls": counter.calls,
+        "max_depth": counter.max_depth,
+        "wall_time_s": wall,
+        "peak_bytes": peak,
+        "python": platform.python_version(),
+    }
+
+
+def profile_all(sizes):
+    results = []
+    for name, (_, limit, _) in STRATEGIES.items():
+        for n in sizes:
+            if limit is None or n <= limit:
+                results.append(profile_strategy(name, n))
+    return results
+
+
+def write_report(results, path):
+    with open(path, "w", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            json.dump(results, f, indent=2)
+
+
+def print_report(results):
+    print(" %-14s | %6s | %9s | %9s | %12s | %12s" % ("Strategy", "n", "Calls", "Max depth", "Wall time", "Peak bytes"))
+    print("-" * 80)
+    for r in results:
+        print(" %-14s | %6d | %9d | %9d | %11.6fs | %12d" % (
+            r["strategy"], r["n"], r["calls"], r["max_depth"], r["wall_time_s"], r["peak_bytes"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the A1.py Fibonacci strategies")
+    parser.add_argument("sizes", nargs="*", type=int, default=[10, 20, 25, 1000])
+    parser.add_argument("-o", "--output", help="write the report to a .json or .csv file")
+    args = parser.parse_args()
+
+    results = profile_all(args.sizes)
+    print_report(results)
+    if args.output:
+        write_report(results, args.output)
+        print("\nReport written to", args.output)
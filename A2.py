@@ -1,4 +1,18 @@
-string = 'BCAADDDCCACACAC' 
+import heapq
+import mmap
+import os
+import re
+import struct
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import add
+
+try:
+    import numpy as np
+except ImportError:  # numpy only speeds up the byte encoder
+    np = None
 
 class NodeTree(object): 
     def __init__(self, left=None, right=None): 
@@ -14,40 +28,1012 @@ class NodeTree(object):
     def __str__(self): 
         return '%s_%s' % (self.left, self.right) 
 
+# {symbol: '0'/'1' code string}, walked with an explicit stack so deep
+# trees do not hit the recursion limit and no per-level dicts are merged
 def huffman_code_tree(node, left=True, binString=''): 
-    if type(node) is str: 
-        return {node: binString} 
-    (l, r) = node.children() 
     d = dict() 
-    d.update(huffman_code_tree(l, True, binString + '0')) 
-    d.update(huffman_code_tree(r, False, binString + '1')) 
+    stack = [(node, binString)]
+    while stack:
+        node, binString = stack.pop()
+        if not isinstance(node, NodeTree):  # leaf: any symbol (str, byte value, ...)
+            d[node] = binString
+            continue
+        (l, r) = node.children() 
+        stack.append((r, binString + '1'))
+        stack.append((l, binString + '0'))
     return d 
 
-freq = {} 
-for c in string: 
-    if c in freq: 
-        freq[c] += 1 
-    else: 
-        freq[c] = 1 
-
-freq = sorted(freq.items(), key=lambda x: x[1], reverse=True) 
-
-nodes = freq 
-
-while len(nodes) > 1: 
-    (key1, c1) = nodes[-1] 
-    (key2, c2) = nodes[-2] 
-    nodes = nodes[:-2] 
-    node = NodeTree(key1, key2) 
-    nodes.append((node, c1 + c2))
-    nodes = sorted(nodes, key=lambda x: x[1], reverse=True) 
-
-huffmanCode = huffman_code_tree(nodes[0][0]) 
-
-print(' Char | Huffman code ') 
-print('----------------------') 
-for (char, frequency) in freq: 
-    print(' %-4r |%12s' % (char, huffmanCode[char]))
+# Original builder: re-sort the whole node list after every merge, O(k^2 log k)
+# freq is a list of (symbol, count) pairs
+def build_huffman_tree_by_sorting(freq):
+    nodes = sorted(freq, key=lambda x: x[1], reverse=True)
+    if not nodes:
+        return None
+    while len(nodes) > 1:
+        (key1, c1) = nodes[-1]
+        (key2, c2) = nodes[-2]
+        nodes = nodes[:-2]
+        node = NodeTree(key1, key2)
+        nodes.append((node, c1 + c2))
+        nodes = sorted(nodes, key=lambda x: x[1], reverse=True)
+    return nodes[0][0]
+
+# Heap builder, O(k log k)
+# Ties are broken exactly like the sorting builder (equal counts: the later
+# entry is merged first, new nodes count as the latest), so both produce
+# the same tree and therefore identical code lengths.
+def build_huffman_tree(freq):
+    heap = [(count, -seq, symbol) for seq, (symbol, count) in enumerate(freq)]
+    if not heap:
+        return None
+    heapq.heapify(heap)
+    seq = len(heap)
+    while len(heap) > 1:
+        c1, _, key1 = heapq.heappop(heap)
+        c2, _, key2 = heapq.heappop(heap)
+        heapq.heappush(heap, (c1 + c2, -seq, NodeTree(key1, key2)))
+        seq += 1
+    return heap[0][2]
+
+# Two-queue builder, O(k) for frequencies already sorted in ascending order
+# Merged nodes are created in non-decreasing count order, so a second FIFO
+# queue stays sorted and the two smallest are always at the queue fronts.
+# The result is optimal (same total encoded length as the other builders);
+# among equal counts the merge order, and so individual lengths, may differ.
+def build_huffman_tree_sorted(freq):
+    leaves = deque(freq)
+    merged = deque()
+    if not leaves:
+        return None
+
+    def pop_smallest():
+        if not merged or (leaves and leaves[0][1] < merged[0][1]):
+            return leaves.popleft()
+        return merged.popleft()
+
+    while len(leaves) + len(merged) > 1:
+        (key1, c1) = pop_smallest()
+        (key2, c2) = pop_smallest()
+        merged.append((NodeTree(key1, key2), c1 + c2))
+    return (merged or leaves)[0][0]
+
+# Integer codes: {symbol: (code, length)}, bits read most significant first
+# Same walk as huffman_code_tree but carrying (code, length) integers
+# instead of building strings. A tree with a single symbol still needs one
+# bit per symbol, so it gets code 0 of length 1.
+def huffman_codes(root):
+    if root is None:
+        return {}
+    if not isinstance(root, NodeTree):
+        return {root: (0, 1)}
+    codes = {}
+    stack = [(root, 0, 0)]
+    while stack:
+        node, code, length = stack.pop()
+        if isinstance(node, NodeTree):
+            code <<= 1
+            length += 1
+            stack.append((node.right, code | 1, length))
+            stack.append((node.left, code, length))
+        else:
+            codes[node] = (code, length)
+    return codes
+
+# Code lengths only: {symbol: length}
+def huffman_code_lengths(root):
+    return {symbol: length for symbol, (_, length) in huffman_codes(root).items()}
+
+# Canonical Huffman codes
+# Only the lengths matter: symbols sorted by (length, symbol) get consecutive
+# codes, stepping to the next length by shifting left. The decoder can
+# rebuild the exact codes from the lengths alone, without the tree.
+def canonical_codes(lengths):
+    return assign_canonical_codes(sorted(lengths.items(), key=lambda x: (x[1], x[0])))
+
+# Same, for (symbol, length) pairs already in canonical order: O(alphabet)
+def assign_canonical_codes(pairs):
+    codes = {}
+    code = 0
+    prev_length = 0
+    for symbol, length in pairs:
+        if length < prev_length:
+            raise ValueError("code lengths are not in canonical order")
+        code <<= length - prev_length
+        if code >> length:
+            raise ValueError("code lengths do not form a prefix code")
+        codes[symbol] = (code, length)
+        code += 1
+        prev_length = length
+    return codes
+
+# Compact header for a byte alphabet: >H number of symbols, then one
+# (>B symbol, >B length) pair per symbol in canonical order
+def pack_code_lengths(lengths):
+    pairs = sorted(lengths.items(), key=lambda x: (x[1], x[0]))
+    return struct.pack('>H', len(pairs)) + bytes(b for pair in pairs for b in pair)
+
+# Returns (canonical codes, position after the header)
+def unpack_code_lengths(buf, pos=0):
+    (k,) = struct.unpack_from('>H', buf, pos)
+    pos += 2
+    raw = bytes(buf[pos:pos + 2 * k])
+    return assign_canonical_codes(zip(raw[0::2], raw[1::2])), pos + 2 * k
+
+# Packs Huffman codes into bytes
+# encode() returns only complete bytes and keeps the leftover (< 8) bits for
+# the next call, so input can be fed in pieces; flush() pads the final byte
+# with zeros. For byte input (symbols 0..255) the packing is vectorized with
+# numpy, one row of code bits per symbol.
+class HuffmanEncoder(object):
+    CHUNK = 1 << 16  # symbols per numpy batch (bounds the bit-per-code-bit temporaries)
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.nbits = 0  # total bits produced so far
+        self.acc = 0  # pending bits (pure-Python path)
+        self.pending = 0  # number of pending bits
+        self.bit_rows = None
+        if np is not None and codes and all(isinstance(s, int) and 0 <= s < 256 for s in codes):
+            width = max(l for _, l in codes.values())  # row width = longest code
+            rows = np.zeros((256, width), dtype=np.uint8)
+            lengths = np.zeros(256, dtype=np.int64)
+            for symbol, (code, length) in codes.items():
+                rows[symbol, :length] = [int(b) for b in format(code, '0%db' % length)]
+                lengths[symbol] = length
+            self.bit_rows = rows
+            self.row_masks = np.arange(width) < lengths[:, None]
+            self.lengths = lengths
+
+    def encode(self, data):
+        if self.bit_rows is not None and isinstance(data, (bytes, bytearray, memoryview)):
+            return self._encode_numpy(data)
+        out = bytearray()
+        acc, pending, codes = self.acc, self.pending, self.codes
+        for symbol in data:
+            code, length = codes[symbol]
+            acc = (acc << length) | code
+            pending += length
+            if pending >= 32:
+                pending -= 32
+                out += (acc >> pending).to_bytes(4, 'big')
+                acc &= (1 << pending) - 1
+        self.nbits += len(out) * 8 + pending - self.pending
+        whole = pending // 8 * 8
+        out += (acc >> (pending - whole)).to_bytes(whole // 8, 'big')
+        self.acc, self.pending = acc & ((1 << (pending - whole)) - 1), pending - whole
+        return bytes(out)
+
+    def _encode_numpy(self, data):
+        symbols = np.frombuffer(data, dtype=np.uint8)
+        out = []
+        nbits = 0
+        carry = np.array([int(b) for b in format(self.acc, '0%db' % self.pending)] if self.pending else [],
+                         dtype=np.uint8)
+        # Everything per chunk, so temporaries stay O(CHUNK) whatever the input size
+        for start in range(0, len(symbols), self.CHUNK):
+            chunk = symbols[start:start + self.CHUNK]
+            lengths = self.lengths[chunk]
+            unknown = lengths == 0
+            if unknown.any():
+                raise KeyError(int(chunk[unknown.argmax()]))
+            nbits += int(lengths.sum())
+            bits = np.concatenate((carry, self.bit_rows[chunk][self.row_masks[chunk]]))
+            whole = len(bits) // 8 * 8
+            out.append(np.packbits(bits[:whole]).tobytes())
+            carry = bits[whole:]
+        self.nbits += nbits
+        self.pending = len(carry)
+        self.acc = int(''.join(map(str, carry)) or '0', 2)
+        return b''.join(out)
+
+    def flush(self):
+        if not self.pending:
+            return b''
+        last = bytes([(self.acc << (8 - self.pending)) & 0xFF])
+        self.acc = self.pending = 0
+        return last
+
+# Encode a whole sequence: returns (payload bytes, number of valid bits)
+def huffman_encode(data, codes):
+    encoder = HuffmanEncoder(codes)
+    payload = encoder.encode(data) + encoder.flush()
+    return payload, encoder.nbits
+
+# Decode by walking the tree one bit at a time; returns a list of symbols
+def huffman_decode(payload, nbits, root):
+    out = []
+    if root is None or nbits == 0:
+        return out
+    if not isinstance(root, NodeTree):  # single symbol: one '0' bit each
+        return [root] * nbits
+    node = root
+    for i in range(nbits):
+        bit = (payload[i >> 3] >> (7 - (i & 7))) & 1
+        node = node.right if bit else node.left
+        if not isinstance(node, NodeTree):
+            out.append(node)
+            node = root
+    return out
+
+# Table-driven decoder
+# Every table_bits-wide bit window is pre-decoded: table[window] holds the
+# symbols that window completes and the bits they use, so one lookup emits
+# several short codes at once. Windows that complete no symbol (codes longer
+# than table_bits) and the last bits of the stream fall back to walking a
+# small trie built from the codes.
+class TableDecoder(object):
+    def __init__(self, codes, table_bits=12):
+        self.table_bits = table_bits
+        self.max_length = max([length for _, length in codes.values()] or [0])
+        self.trie = [None, None]  # internal node: [child0, child1]; leaf: (symbol,)
+        for symbol, (code, length) in codes.items():
+            node = self.trie
+            for i in range(length - 1, 0, -1):
+                bit = (code >> i) & 1
+                if node[bit] is None:
+                    node[bit] = [None, None]
+                node = node[bit]
+            node[code & 1] = (symbol,)
+        self.table = [self._decode_window(w) for w in range(1 << table_bits)]
+
+    def _decode_window(self, window):
+        symbols = []
+        used = 0
+        node = self.trie
+        for i in range(self.table_bits - 1, -1, -1):
+            node = node[(window >> i) & 1]
+            if node is None:  # no code starts with these bits
+                break
+            if type(node) is tuple:
+                symbols.append(node[0])
+                used = self.table_bits - i
+                node = self.trie
+        return tuple(symbols), used
+
+    def _decode_one(self, acc, avail):
+        # Slow path: one symbol, one bit at a time (acc holds a whole code)
+        node = self.trie
+        while True:
+            avail -= 1
+            node = node[(acc >> avail) & 1]
+            if node is None:
+                raise ValueError("invalid Huffman code in input")
+            if type(node) is tuple:
+                return node[0], avail
+
+    # Decode a payload split into byte chunks; yields one list of symbols per
+    # chunk. Up to max(table_bits, longest code) bits are carried between
+    # chunks, so memory does not depend on the payload size. start_bit (0-7)
+    # skips leading bits of the first byte, for streams that start mid-byte.
+    def decode_chunks(self, chunks, nbits, start_bit=0):
+        k = self.table_bits
+        need = max(k, self.max_length)  # bits buffered before each step
+        mask = (1 << k) - 1
+        table = self.table
+        acc = avail = 0
+        if start_bit and nbits:
+            chunks = iter(chunks)
+            first = next(chunks)
+            acc = first[0] & ((1 << (8 - start_bit)) - 1)
+            avail = 8 - start_bit
+            chunks = chain([memoryview(first)[1:]], chunks)
+        left = nbits  # valid bits not yet decoded
+        padding = bytes(need // 8 + 2)  # zeros after the end so every step can look ahead
+        for data in chain(chunks, [padding]):
+            out = []
+            extend = out.extend
+            pos = 0
+            n = len(data)
+            while left > 0:
+                while avail < need and pos < n:
+                    acc = (acc << 8) | data[pos]
+                    pos += 1
+                    avail += 8
+                if avail < need:
+                    break  # wait for the next chunk
+                symbols, used = table[(acc >> (avail - k)) & mask]
+                if used and used <= left:
+                    extend(symbols)
+                else:
+                    symbol, rest = self._decode_one(acc, avail)
+                    used = avail - rest
+                    if used > left:
+                        raise ValueError("truncated Huffman stream")
+                    out.append(symbol)
+                avail -= used
+                left -= used
+                acc &= (1 << avail) - 1
+            yield out
+        if left > 0:
+            raise ValueError("truncated Huffman stream")
+
+    def decode(self, payload, nbits, start_bit=0):
+        out = []
+        for symbols in self.decode_chunks([payload], nbits, start_bit):
+            out.extend(symbols)
+        return out
+
+    # Byte symbols as bytes, fed chunk_size bytes at a time so the only
+    # symbol list alive is the current chunk's (not one for the whole output)
+    def decode_bytes(self, payload, nbits, start_bit=0, chunk_size=1 << 16):
+        view = memoryview(payload)
+        chunks = (view[i:i + chunk_size] for i in range(0, len(view), chunk_size))
+        return b''.join(bytes(symbols) for symbols in self.decode_chunks(chunks, nbits, start_bit))
+
+# Byte counts over an iterable of byte chunks: {byte value: count}
+# numpy bincount per chunk when available, else Counter's C counting loop.
+def count_byte_frequencies(chunks):
+    if np is not None:
+        counts = np.zeros(256, dtype=np.int64)
+        for chunk in chunks:
+            symbols = np.frombuffer(chunk, dtype=np.uint8)
+            # bincount widens its input to intp, so count 1 MB at a time
+            for start in range(0, len(symbols), 1 << 20):
+                counts += np.bincount(symbols[start:start + (1 << 20)], minlength=256)
+        return {symbol: int(counts[symbol]) for symbol in counts.nonzero()[0].tolist()}
+    counts = Counter()
+    for chunk in chunks:
+        counts.update(bytes(chunk))
+    return dict(counts)
+
+# Length-limited code lengths (package-merge), {symbol: length <= max_length}
+# Optimal among prefix codes whose longest code is at most max_length bits.
+# Each round pairs up adjacent items of the previous list into packages and
+# merges them with the original leaves by weight; after max_length - 1 rounds
+# the 2n - 2 lightest items are taken and a symbol's code length is the
+# number of times it occurs in them. Only whether each item is a package is
+# stored per round: a taken prefix of k items holds the lightest
+# (k - packages) leaves and expands to the first 2 * packages items of the
+# round before, so lengths are recovered by walking the rounds backwards.
+def limited_code_lengths(counts, max_length):
+    symbols = [symbol for symbol, _ in sorted(counts.items(), key=lambda x: x[1])]
+    n = len(symbols)
+    if n <= 1:
+        return {symbol: 1 for symbol in symbols}
+    if n > 1 << max_length:
+        raise ValueError("%d symbols do not fit in %d-bit codes" % (n, max_length))
+    leaves = [counts[symbol] for symbol in symbols]
+    weights = leaves
+    rounds = [bytes(n)]  # per round: 1 where the merged item is a package
+    for _ in range(max_length - 1):
+        merged = leaves + list(map(add, weights[0:-1:2], weights[1::2]))
+        order = sorted(range(len(merged)), key=merged.__getitem__)  # stable: leaves win ties
+        weights = [merged[i] for i in order]
+        rounds.append(bytes(map(n.__le__, order)))
+    taken_leaves = [0] * (n + 1)  # taken_leaves[k]: rounds whose taken prefix has k leaves
+    take = 2 * n - 2
+    for flags in reversed(rounds):
+        packages = flags[:take].count(1)
+        taken_leaves[take - packages] += 1
+        take = 2 * packages
+    lengths = {}
+    length = 0
+    for i in range(n, 0, -1):  # symbol i-1 is in every prefix with at least i leaves
+        length += taken_leaves[i]
+        lengths[symbols[i - 1]] = length
+    return lengths
+
+# Frequencies of any input
+# Bytes-like data (bytes, bytearray, memoryview, mmap) -> byte counts via
+# count_byte_frequencies; text and other iterables -> Counter.
+def count_frequencies(data):
+    if isinstance(data, (bytes, bytearray, memoryview, mmap.mmap)):
+        return count_byte_frequencies([data])
+    return dict(Counter(data))
+
+# Byte counts of a file, counted in shards of shard_size bytes over a
+# memory map and merged; with workers > 1 the shards run in a process pool
+SHARD_SIZE = 64 << 20
+
+def count_shard(path, offset, length):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return count_byte_frequencies([memoryview(m)[offset:offset + length]])
+
+def count_file_frequencies(path, workers=None, shard_size=SHARD_SIZE):
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    shards = [(path, offset, min(shard_size, size - offset)) for offset in range(0, size, shard_size)]
+    counts = Counter()
+    for shard in ordered_map(count_shard, shards, workers):
+        counts.update(shard)
+    return dict(counts)
+
+# {length: (number of symbols, number of coded occurrences)} for a code
+def code_length_histogram(lengths, counts=None):
+    histogram = {}
+    for symbol, length in lengths.items():
+        symbols, occurrences = histogram.get(length, (0, 0))
+        histogram[length] = (symbols + 1, occurrences + (counts[symbol] if counts else 0))
+    return dict(sorted(histogram.items()))
+
+# Code lengths for a byte alphabet from its counts
+# max_length caps the longest code (package-merge); None keeps plain Huffman.
+def byte_code_lengths(counts, max_length=None):
+    freq = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+    lengths = huffman_code_lengths(build_huffman_tree(freq))
+    if max_length is not None and lengths and max(lengths.values()) > max_length:
+        lengths = limited_code_lengths(counts, max_length)
+    return lengths
+
+# Byte-string compression
+# Layout: canonical code-length header (pack_code_lengths), >Q payload bits,
+# then the payload. At most 2 + 2*256 + 8 bytes of overhead.
+def compress(data, max_code_length=None):
+    lengths = byte_code_lengths(count_byte_frequencies([data]), max_code_length)
+    payload, nbits = huffman_encode(data, canonical_codes(lengths))
+    return pack_code_lengths(lengths) + struct.pack('>Q', nbits) + payload
+
+def decompress(blob):
+    codes, pos = unpack_code_lengths(blob)
+    (nbits,) = struct.unpack_from('>Q', blob, pos)
+    decoder = TableDecoder(codes)
+    return decoder.decode_bytes(memoryview(blob)[pos + 8:], nbits)
+
+# Streaming compression (same format as compress/decompress)
+# Two passes over a seekable input, chunk_size bytes at a time: count, then
+# encode. The payload bit count is known after the first pass (sum of
+# count * length), so the header is written before any payload.
+CHUNK_SIZE = 1 << 20
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    return iter(lambda: stream.read(chunk_size), b'')
+
+def compress_stream(fin, fout, chunk_size=CHUNK_SIZE, max_code_length=None):
+    start = fin.tell()
+    counts = count_byte_frequencies(read_chunks(fin, chunk_size))
+    lengths = byte_code_lengths(counts, max_code_length)
+    nbits = sum(count * lengths[symbol] for symbol, count in counts.items())
+    fout.write(pack_code_lengths(lengths) + struct.pack('>Q', nbits))
+    fin.seek(start)
+    encoder = HuffmanEncoder(canonical_codes(lengths))
+    for chunk in read_chunks(fin, chunk_size):
+        fout.write(encoder.encode(chunk))
+    fout.write(encoder.flush())
+
+def decompress_stream(fin, fout, chunk_size=CHUNK_SIZE):
+    (k,) = struct.unpack('>H', fin.read(2))
+    codes, _ = unpack_code_lengths(struct.pack('>H', k) + fin.read(2 * k))
+    (nbits,) = struct.unpack('>Q', fin.read(8))
+    decoder = TableDecoder(codes)
+    for symbols in decoder.decode_chunks(read_chunks(fin, chunk_size), nbits):
+        fout.write(bytes(symbols))
+
+def compress_file(src, dst, chunk_size=CHUNK_SIZE, max_code_length=None):
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        compress_stream(fin, fout, chunk_size, max_code_length)
+
+def decompress_file(src, dst, chunk_size=CHUNK_SIZE):
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        decompress_stream(fin, fout, chunk_size)
+
+# Block container (parallel, random access)
+# Input is cut into independent blocks of block_size bytes, each encoded with
+# its own code table (or one shared table counted over the whole input) in a
+# process pool. Layout:
+#   b'HUFB', >B shared flag, >Q block size, [shared: code-length header]
+#   blocks: per-block tables -> compress() output; shared -> >Q bits + payload
+#   index: >QQQ (offset, compressed size, raw size) per block
+#   footer: >Q index offset, >Q block count, b'HUFB'
+BLOCK_MAGIC = b'HUFB'
+BLOCK_SIZE = 4 << 20
+FOOTER = struct.Struct('>QQ4s')
+INDEX_ENTRY = struct.Struct('>QQQ')
+
+def compress_block(data, lengths=None, max_code_length=None):
+    if lengths is None:
+        return compress(data, max_code_length)
+    payload, nbits = huffman_encode(data, canonical_codes(lengths))
+    return struct.pack('>Q', nbits) + payload
+
+def decompress_block(blob, codes=None):
+    if codes is None:
+        return decompress(blob)
+    (nbits,) = struct.unpack_from('>Q', blob, 0)
+    return TableDecoder(codes).decode_bytes(memoryview(blob)[8:], nbits)
+
+# Runs func over the argument tuples with at most 2 * workers tasks in
+# flight, yielding results in order (so memory stays bounded by the window)
+def ordered_map(func, arg_tuples, workers):
+    if workers == 1:
+        for args in arg_tuples:
+            yield func(*args)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for args in arg_tuples:
+            pending.append(pool.submit(func, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def compress_blocks(fin, fout, block_size=BLOCK_SIZE, workers=None, shared_table=False,
+                    max_code_length=None):
+    workers = workers or os.cpu_count() or 1
+    lengths = None
+    fout.write(BLOCK_MAGIC + struct.pack('>BQ', shared_table, block_size))
+    if shared_table:
+        start = fin.tell()
+        lengths = byte_code_lengths(count_byte_frequencies(read_chunks(fin)), max_code_length)
+        fin.seek(start)
+        fout.write(pack_code_lengths(lengths))
+    index = []
+    raw_sizes = deque()
+
+    def blocks():
+        for block in read_chunks(fin, block_size):
+            raw_sizes.append(len(block))
+            yield block, lengths, max_code_length
+
+    offset = fout.tell()
+    for blob in ordered_map(compress_block, blocks(), workers):
+        fout.write(blob)
+        index.append((offset, len(blob), raw_sizes.popleft()))
+        offset += len(blob)
+    for entry in index:
+        fout.write(INDEX_ENTRY.pack(*entry))
+    fout.write(FOOTER.pack(offset, len(index), BLOCK_MAGIC))
+
+# Reads a block container; read_block(i) decodes one block without touching
+# the others, read_blocks() decodes a range in a process pool
+class BlockReader(object):
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, self.shared_table, self.block_size = struct.unpack('>4sBQ', f.read(13))
+            if magic != BLOCK_MAGIC:
+                raise ValueError("not a Huffman block container")
+            self.lengths = None
+            if self.shared_table:
+                (k,) = struct.unpack('>H', f.read(2))
+                raw = f.read(2 * k)
+                self.lengths = dict(zip(raw[0::2], raw[1::2]))
+            f.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, count, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != BLOCK_MAGIC:
+                raise ValueError("truncated Huffman block container")
+            f.seek(index_offset)
+            raw = f.read(count * INDEX_ENTRY.size)
+        self.index = list(INDEX_ENTRY.iter_unpack(raw))
+
+    def __len__(self):
+        return len(self.index)
+
+    def read_block(self, i):
+        offset, size, _ = self.index[i]
+        return read_container_block(self.path, offset, size, self.lengths)
+
+    def read_blocks(self, start=0, stop=None, workers=None):
+        workers = workers or os.cpu_count() or 1
+        args = [(self.path, offset, size, self.lengths)
+                for offset, size, _ in self.index[start:stop]]
+        return ordered_map(read_container_block, args, workers)
+
+def read_container_block(path, offset, size, lengths=None):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        blob = f.read(size)
+    return decompress_block(blob, None if lengths is None else canonical_codes(lengths))
+
+def compress_file_blocks(src, dst, block_size=BLOCK_SIZE, workers=None, shared_table=False,
+                         max_code_length=None):
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        compress_blocks(fin, fout, block_size, workers, shared_table, max_code_length)
+
+def decompress_file_blocks(src, dst, workers=None):
+    reader = BlockReader(src)
+    with open(dst, 'wb') as fout:
+        for block in reader.read_blocks(workers=workers):
+            fout.write(block)
+
+# Indexed container (random access through a memory map)
+# Same canonical coding as compress(), plus a sync point every sync_interval
+# symbols: the bit offset where that symbol's code starts. A read of
+# [start, stop) decodes only from the sync point at or before start up to
+# the one after stop. Layout:
+#   b'HUFS', >Q symbols, >I sync interval, code-length header, >Q bits
+#   payload
+#   sync index: >Q bit offset per sync point
+#   footer: >Q index offset, >Q sync points, b'HUFS'
+INDEX_MAGIC = b'HUFS'
+SYNC_INTERVAL = 4096
+
+def compress_indexed_stream(fin, fout, sync_interval=SYNC_INTERVAL, chunk_size=CHUNK_SIZE,
+                            max_code_length=None):
+    start = fin.tell()
+    counts = count_byte_frequencies(read_chunks(fin, chunk_size))
+    lengths = byte_code_lengths(counts, max_code_length)
+    nbits = sum(count * lengths[symbol] for symbol, count in counts.items())
+    fout.write(INDEX_MAGIC + struct.pack('>QI', sum(counts.values()), sync_interval))
+    fout.write(pack_code_lengths(lengths) + struct.pack('>Q', nbits))
+    fin.seek(start)
+    encoder = HuffmanEncoder(canonical_codes(lengths))
+    sync = []
+    chunk_size = max(chunk_size // sync_interval, 1) * sync_interval  # whole intervals per read
+    for chunk in read_chunks(fin, chunk_size):
+        for i in range(0, len(chunk), sync_interval):
+            sync.append(encoder.nbits)
+            fout.write(encoder.encode(chunk[i:i + sync_interval]))
+    fout.write(encoder.flush())
+    index_offset = fout.tell()
+    fout.write(struct.pack('>%dQ' % len(sync), *sync))
+    fout.write(FOOTER.pack(index_offset, len(sync), INDEX_MAGIC))
+
+def compress_file_indexed(src, dst, sync_interval=SYNC_INTERVAL, max_code_length=None):
+    with open(src, 'rb') as fin, open(dst, 'wb') as fout:
+        compress_indexed_stream(fin, fout, sync_interval, max_code_length=max_code_length)
+
+class IndexedReader(object):
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.sync_interval = struct.unpack_from('>4sQI', self.map, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError("not an indexed Huffman file")
+        codes, pos = unpack_code_lengths(self.map, 16)
+        (self.nbits,) = struct.unpack_from('>Q', self.map, pos)
+        self.payload_offset = pos + 8
+        index_offset, count, magic = FOOTER.unpack_from(self.map, len(self.map) - FOOTER.size)
+        if magic != INDEX_MAGIC:
+            raise ValueError("truncated indexed Huffman file")
+        self.sync = struct.unpack_from('>%dQ' % count, self.map, index_offset)
+        self.decoder = TableDecoder(codes)
+
+    def __len__(self):
+        return self.size
+
+    def read(self, start, stop):
+        start, stop = max(start, 0), min(stop, self.size)
+        if start >= stop:
+            return b''
+        first = start // self.sync_interval
+        last = (stop - 1) // self.sync_interval + 1
+        bit = self.sync[first]
+        end_bit = self.sync[last] if last < len(self.sync) else self.nbits
+        byte = self.payload_offset + bit // 8
+        view = memoryview(self.map)[byte:self.payload_offset + (end_bit + 7) // 8]
+        try:
+            symbols = self.decoder.decode_bytes(view, end_bit - bit, bit % 8)
+        finally:
+            view.release()
+        skip = start - first * self.sync_interval
+        return symbols[skip:skip + stop - start]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.size)
+            if step < 0:
+                # decode the covering range forwards, then walk it backwards
+                return self.read(stop + 1, start + 1)[::-1][::-step]
+            return self.read(start, stop)[::step] if step != 1 else self.read(start, stop)
+        if item < 0:
+            item += self.size
+        if not 0 <= item < self.size:
+            raise IndexError("index out of range")
+        return self.read(item, item + 1)[0]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Adaptive (FGK) Huffman coding: one pass, no header, no frequency table
+# Encoder and decoder start from the same tree holding only the NYT ("not yet
+# transmitted") leaf and apply the same update after every symbol. A symbol
+# seen for the first time is sent as the NYT code followed by its 9-bit value;
+# value 256 marks the end of the stream.
+ADAPTIVE_EOF = 256
+ADAPTIVE_RAW_BITS = 9
+
+# Nodes live at fixed positions ("node numbers"); weights never decrease with
+# the number (sibling property), so the highest-numbered node of a weight is
+# found by scanning upwards, and swapping two nodes moves their subtrees.
+class AdaptiveHuffmanTree(object):
+    def __init__(self, alphabet=257):
+        size = 2 * alphabet + 1
+        self.root = size - 1
+        self.weight = [0] * size
+        self.parent = [-1] * size
+        self.left = [-1] * size  # children by position, -1 for leaves
+        self.right = [-1] * size
+        self.symbol = [-1] * size  # -1: internal node or NYT
+        self.leaf = {}  # symbol -> position
+        self.nyt = self.root
+
+    def code(self, symbol):
+        # (code, length) of a known symbol, or of NYT if unseen
+        node = self.leaf.get(symbol, self.nyt)
+        code = length = 0
+        parent, right = self.parent, self.right
+        while node != self.root:
+            up = parent[node]
+            if right[up] == node:
+                code |= 1 << length
+            length += 1
+            node = up
+        return code, length
+
+    def _swap(self, a, b):
+        left, right, symbol, parent = self.left, self.right, self.symbol, self.parent
+        left[a], left[b] = left[b], left[a]
+        right[a], right[b] = right[b], right[a]
+        symbol[a], symbol[b] = symbol[b], symbol[a]
+        for node in (a, b):
+            if left[node] != -1:
+                parent[left[node]] = node
+                parent[right[node]] = node
+            elif symbol[node] != -1:
+                self.leaf[symbol[node]] = node
+
+    def update(self, symbol):
+        weight, parent = self.weight, self.parent
+        node = self.leaf.get(symbol)
+        if node is None:
+            # NYT splits into a new NYT (left) and the new leaf (right)
+            old = self.nyt
+            self.left[old], self.right[old] = old - 2, old - 1
+            parent[old - 2] = parent[old - 1] = old
+            self.symbol[old - 1] = symbol
+            self.leaf[symbol] = old - 1
+            self.nyt = old - 2
+            weight[old - 1] = 1
+            node = old
+        while True:
+            w = weight[node]
+            leader = node
+            while leader < self.root and weight[leader + 1] == w:
+                leader += 1
+            if leader != node and leader != parent[node]:
+                self._swap(node, leader)
+                node = leader
+            weight[node] = w + 1
+            if node == self.root:
+                return
+            node = parent[node]
+
+class AdaptiveHuffmanEncoder(object):
+    def __init__(self):
+        self.tree = AdaptiveHuffmanTree()
+        self.acc = 0
+        self.pending = 0
+
+    def _put(self, code, length, out):
+        self.acc = (self.acc << length) | code
+        self.pending += length
+        if self.pending >= 32:
+            self.pending -= 32
+            out += (self.acc >> self.pending).to_bytes(4, 'big')
+            self.acc &= (1 << self.pending) - 1
+
+    def _put_symbol(self, symbol, out):
+        tree = self.tree
+        code, length = tree.code(symbol)
+        self._put(code, length, out)
+        if symbol not in tree.leaf:
+            self._put(symbol, ADAPTIVE_RAW_BITS, out)
+        tree.update(symbol)
+
+    def encode(self, data):
+        out = bytearray()
+        for symbol in data:
+            self._put_symbol(symbol, out)
+        return bytes(out)
+
+    def flush(self):
+        out = bytearray()
+        self._put_symbol(ADAPTIVE_EOF, out)
+        self._put(0, -self.pending % 8, out)
+        out += self.acc.to_bytes(self.pending // 8, 'big')
+        self.acc = self.pending = 0
+        return bytes(out)
+
+# Bit-at-a-time decoder; state (tree position or pending raw bits) carries
+# over between chunks, so input can be split anywhere
+class AdaptiveHuffmanDecoder(object):
+    def __init__(self):
+        self.tree = AdaptiveHuffmanTree()
+        self.node = self.tree.root
+        self.raw = 0
+        self.raw_left = ADAPTIVE_RAW_BITS  # the root starts out as NYT
+        self.finished = False
+
+    def decode(self, data):
+        out = bytearray()
+        tree = self.tree
+        left, right, symbol = tree.left, tree.right, tree.symbol
+        node, raw, raw_left = self.node, self.raw, self.raw_left
+        for byte in data:
+            if self.finished:
+                break
+            for shift in range(7, -1, -1):
+                bit = (byte >> shift) & 1
+                if raw_left:
+                    raw = (raw << 1) | bit
+                    raw_left -= 1
+                    if raw_left:
+                        continue
+                    value, raw = raw, 0
+                else:
+                    node = right[node] if bit else left[node]
+                    if left[node] != -1:
+                        continue
+                    if node == tree.nyt:
+                        raw_left = ADAPTIVE_RAW_BITS
+                        continue
+                    value = symbol[node]
+                if value == ADAPTIVE_EOF:
+                    self.finished = True
+                    break
+                out.append(value)
+                tree.update(value)
+                node = tree.root
+        self.node, self.raw, self.raw_left = node, raw, raw_left
+        return bytes(out)
+
+def compress_adaptive(data):
+    encoder = AdaptiveHuffmanEncoder()
+    return encoder.encode(data) + encoder.flush()
+
+def decompress_adaptive(blob):
+    decoder = AdaptiveHuffmanDecoder()
+    out = decoder.decode(blob)
+    if not decoder.finished:
+        raise ValueError("truncated adaptive Huffman stream")
+    return out
+
+# Single pass over any readable stream (pipes and sockets included)
+def compress_adaptive_stream(fin, fout, chunk_size=CHUNK_SIZE):
+    encoder = AdaptiveHuffmanEncoder()
+    for chunk in read_chunks(fin, chunk_size):
+        fout.write(encoder.encode(chunk))
+    fout.write(encoder.flush())
+
+def decompress_adaptive_stream(fin, fout, chunk_size=CHUNK_SIZE):
+    decoder = AdaptiveHuffmanDecoder()
+    for chunk in read_chunks(fin, chunk_size):
+        fout.write(decoder.decode(chunk))
+        if decoder.finished:
+            return
+    raise ValueError("truncated adaptive Huffman stream")
+
+# Token alphabets (words, n-grams, integers, any hashable symbol)
+# Tokens are interned to dense ids 0..k-1, and the tree for k ids is kept
+# in flat int arrays instead of NodeTree objects: leaves are 0..k-1,
+# internal nodes k..2k-2 in creation order, so every parent has a higher
+# index than its children and the root is the last node.
+class SymbolTable(object):
+    def __init__(self, symbols=()):
+        self.symbols = []
+        self.ids = {}
+        for symbol in symbols:
+            self.intern(symbol)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def intern(self, symbol):
+        i = self.ids.get(symbol)
+        if i is None:
+            i = self.ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return i
+
+    def to_ids(self, tokens):
+        intern = self.intern
+        return [intern(token) for token in tokens]
+
+    def to_symbols(self, ids):
+        symbols = self.symbols
+        return [symbols[i] for i in ids]
+
+# Returns (left, right, parent) arrays for counts indexed by symbol id
+def build_huffman_arrays(counts):
+    k = len(counts)
+    size = max(2 * k - 1, 0)
+    left = array('i', [-1]) * size
+    right = array('i', [-1]) * size
+    parent = array('i', [-1]) * size
+    heap = [(count, i) for i, count in enumerate(counts)]
+    heapq.heapify(heap)
+    node = k
+    while len(heap) > 1:
+        c1, a = heapq.heappop(heap)
+        c2, b = heapq.heappop(heap)
+        left[node], right[node] = a, b
+        parent[a] = parent[b] = node
+        heapq.heappush(heap, (c1 + c2, node))
+        node += 1
+    return left, right, parent
+
+# Code length of every leaf, from the root down (no recursion)
+def array_code_lengths(parent, k):
+    if k == 1:
+        return array('B', [1])
+    depth = array('i', [0]) * len(parent)
+    for node in range(len(parent) - 2, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+    return array('B', depth[:k])
+
+# Integer code and length of every leaf of an array tree: (codes, lengths)
+# Internal nodes are visited from the root down (parents have higher
+# indices), each writing its children's entries into the preallocated
+# arrays, so there is no stack, recursion or per-node object. Codes longer
+# than 64 bits do not fit the arrays and raise OverflowError.
+def array_code_table(left, right, k):
+    if k == 1:
+        return array('Q', [0]), array('B', [1])
+    codes = array('Q', [0]) * len(left)
+    lengths = array('B', [0]) * len(left)
+    for node in range(len(left) - 1, k - 1, -1):
+        code = codes[node] << 1
+        length = lengths[node] + 1
+        l, r = left[node], right[node]
+        codes[l], lengths[l] = code, length
+        codes[r], lengths[r] = code | 1, length
+    return codes[:k], lengths[:k]
+
+# Word-level text compression
+# Tokens are runs of word / non-word characters, so ''.join(tokens) is the
+# original text. Layout: >I token count, per token >I size + serialized
+# token, one length byte per token id, >Q payload bits, payload.
+# to_bytes / from_bytes serialize the distinct tokens for the header: UTF-8
+# for str by default; marshal.dumps / marshal.loads covers integers, n-gram
+# tuples and other built-in hashable tokens.
+TOKEN_PATTERN = re.compile(r'\w+|\W+')
+
+def compress_tokens(tokens, to_bytes=str.encode):
+    table = SymbolTable()
+    ids = table.to_ids(tokens)
+    counts = [0] * len(table)
+    for i in ids:
+        counts[i] += 1
+    lengths = array_code_lengths(build_huffman_arrays(counts)[2], len(table)) if ids else array('B')
+    payload, nbits = huffman_encode(ids, canonical_codes(dict(enumerate(lengths))))
+    header = [struct.pack('>I', len(table))]
+    for token in table.symbols:
+        raw = to_bytes(token)
+        header.append(struct.pack('>I', len(raw)) + raw)
+    header.append(lengths.tobytes())
+    header.append(struct.pack('>Q', nbits))
+    return b''.join(header) + payload
+
+def decompress_tokens(blob, from_bytes=bytes.decode):
+    (k,) = struct.unpack_from('>I', blob, 0)
+    pos = 4
+    symbols = []
+    for _ in range(k):
+        (size,) = struct.unpack_from('>I', blob, pos)
+        symbols.append(from_bytes(bytes(blob[pos + 4:pos + 4 + size])))
+        pos += 4 + size
+    lengths = blob[pos:pos + k]
+    (nbits,) = struct.unpack_from('>Q', blob, pos + k)
+    decoder = TableDecoder(canonical_codes(dict(enumerate(lengths))))
+    return SymbolTable(symbols).to_symbols(decoder.decode(memoryview(blob)[pos + k + 8:], nbits))
+
+def compress_words(text):
+    return compress_tokens(TOKEN_PATTERN.findall(text))
+
+def decompress_words(blob):
+    return ''.join(decompress_tokens(blob))
+
+if __name__ == "__main__":
+    string = 'BCAADDDCCACACAC'
+
+    freq = count_frequencies(string)
+
+    freq = sorted(freq.items(), key=lambda x: x[1], reverse=True)
+
+    huffmanCode = huffman_code_tree(build_huffman_tree(freq))
+
+    print(' Char | Huffman code ')
+    print('----------------------')
+    for (char, frequency) in freq:
+        print(' %-4r |%12s' % (char, huffmanCode[char]))
     
     
     
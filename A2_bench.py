@@ -0,0 +1,442 @@
+import marshal
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from A2 import (
+    huffman_code_tree,
+    build_huffman_tree_by_sorting,
+    build_huffman_tree,
+    build_huffman_tree_sorted,
+    huffman_codes,
+    huffman_encode,
+    HuffmanEncoder,
+    canonical_codes,
+    huffman_decode,
+    TableDecoder,
+    compress,
+    decompress,
+    compress_file,
+    decompress_file,
+    compress_file_blocks,
+    decompress_file_blocks,
+    BlockReader,
+    compress_file_indexed,
+    IndexedReader,
+    byte_code_lengths,
+    limited_code_lengths,
+    compress_adaptive,
+    decompress_adaptive,
+    count_frequencies,
+    count_file_frequencies,
+    code_length_histogram,
+    build_huffman_arrays,
+    array_code_lengths,
+    array_code_table,
+    NodeTree,
+    compress_words,
+    compress_tokens,
+    decompress_tokens,
+    TOKEN_PATTERN,
+    decompress_words,
+)
+
+MB = 1 << 20
+
+# Largest alphabet the original re-sorting builder is timed at
+SORTING_LIMIT = 10 ** 4
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def fmt(seconds):
+    if seconds is None:
+        return "-"
+    return "%.4fs" % seconds
+
+
+def zipf_frequencies(k, seed=0):
+    # Word-like alphabet: symbol i has count ~ N / (i + 1), shuffled order
+    rng = random.Random(seed)
+    freq = [("w%d" % i, 10 ** 6 // (i + 1) + rng.randint(1, 3)) for i in range(k)]
+    rng.shuffle(freq)
+    return freq
+
+
+def encoded_bits(freq, codes):
+    return sum(count * len(codes[symbol]) for symbol, count in freq)
+
+
+def bench_builders(sizes=(256, 1000, 10 ** 4, 10 ** 5)):
+    print("=== Huffman tree construction ===")
+    print(" %8s | %10s | %10s | %10s" % ("symbols", "Sorting", "Heap", "Two-queue"))
+    print("-" * 50)
+    for k in sizes:
+        freq = sorted(zipf_frequencies(k), key=lambda x: x[1], reverse=True)
+        t_heap, root = time_call(build_huffman_tree, freq)
+        heap_codes = huffman_code_tree(root)
+        t_sort = None
+        if k <= SORTING_LIMIT:
+            t_sort, root = time_call(build_huffman_tree_by_sorting, freq)
+            sort_codes = huffman_code_tree(root)
+            assert all(len(sort_codes[s]) == len(heap_codes[s]) for s, _ in freq)
+        t_two, root = time_call(build_huffman_tree_sorted, freq[::-1])
+        assert encoded_bits(freq, huffman_code_tree(root)) == encoded_bits(freq, heap_codes)
+        print(" %8d | %10s | %10s | %10s" % (k, fmt(t_sort), fmt(t_heap), fmt(t_two)))
+
+
+def sample_data(size, path="Churn_Modelling.csv"):
+    # Repeat one of the repo's CSVs up to the requested size
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), path), "rb") as f:
+        text = f.read()
+    return (text * (size // len(text) + 1))[:size]
+
+
+def verify_round_trips():
+    rng = random.Random(1)
+    cases = [
+        b"",
+        b"a",
+        b"a" * 1000,
+        b"BCAADDDCCACACAC",
+        bytes(range(256)),
+        bytes(rng.getrandbits(8) for _ in range(10 ** 5)),
+        bytes(rng.choice(b"ab") for _ in range(10 ** 4)),
+        sample_data(MB // 4),
+    ]
+    for data in cases:
+        assert decompress(compress(data)) == data, data[:20]
+        if data and np is not None:
+            # byte input must reach the vectorized encoder
+            lengths = byte_code_lengths(count_frequencies(data))
+            assert HuffmanEncoder(canonical_codes(lengths)).bit_rows is not None, data[:20]
+    print("Round trip OK for %d inputs" % len(cases))
+
+
+def bench_codec(sizes_mb=(1, 4)):
+    print("\n=== compress / decompress throughput ===")
+    print(" %6s | %8s | %12s | %12s" % ("MB", "ratio", "encode MB/s", "decode MB/s"))
+    print("-" * 50)
+    for size in sizes_mb:
+        data = sample_data(size * MB)
+        t_enc, blob = time_call(compress, data)
+        t_dec, back = time_call(decompress, blob)
+        assert back == data
+        print(" %6d | %8.3f | %12.2f | %12.2f" % (size, len(blob) / len(data), size / t_enc, size / t_dec))
+
+
+def bench_decoders(size_mb=1, table_bits=(8, 10, 12)):
+    print("\n=== Decoding %d MB: tree walk vs lookup tables ===" % size_mb)
+    print(" %-14s | %10s | %10s" % ("decoder", "time", "MB/s"))
+    print("-" * 42)
+    data = sample_data(size_mb * MB)
+    freq = sorted(Counter(data).items(), key=lambda x: x[1], reverse=True)
+    root = build_huffman_tree(freq)
+    codes = huffman_codes(root)
+    payload, nbits = huffman_encode(data, codes)
+    elapsed, out = time_call(huffman_decode, payload, nbits, root)
+    assert bytes(out) == data
+    print(" %-14s | %9.3fs | %10.2f" % ("tree walk", elapsed, size_mb / elapsed))
+    for k in table_bits:
+        decoder = TableDecoder(codes, k)
+        elapsed, out = time_call(decoder.decode, payload, nbits)
+        assert bytes(out) == data
+        print(" %-14s | %9.3fs | %10.2f" % ("table K=%d" % k, elapsed, size_mb / elapsed))
+
+
+def peak_rss_bytes():
+    # ru_maxrss survives fork/exec (it would include the parent's peak), so
+    # prefer this process's own high-water mark where /proc provides it
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux reports KB
+
+
+def run_and_report_rss(func, args):
+    func(*args)
+    return peak_rss_bytes()
+
+
+def peak_rss(func, *args):
+    # Peak resident memory of func(*args) run in a fresh interpreter
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_and_report_rss, func, args).result()
+
+
+def bench_stream(sizes_mb=(4, 32)):
+    print("\n=== Streaming file compression (peak RSS should not grow with size) ===")
+    print(" %6s | %12s | %12s | %12s | %12s" % ("MB", "encode MB/s", "decode MB/s", "enc RSS MB", "dec RSS MB"))
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, packed, back = (os.path.join(tmp, name) for name in ("in", "in.huf", "out"))
+        for size in sizes_mb:
+            with open(src, "wb") as f:
+                for _ in range(size):
+                    f.write(sample_data(MB))
+            t_enc, _ = time_call(compress_file, src, packed)
+            t_dec, _ = time_call(decompress_file, packed, back)
+            with open(src, "rb") as a, open(back, "rb") as b:
+                assert a.read() == b.read()
+            rss_enc = peak_rss(compress_file, src, packed)
+            rss_dec = peak_rss(decompress_file, packed, back)
+            print(" %6d | %12.2f | %12.2f | %12.1f | %12.1f" % (
+                size, size / t_enc, size / t_dec, rss_enc / MB, rss_dec / MB))
+
+
+def bench_blocks(size_mb=16, block_size=MB, max_workers=None):
+    max_workers = max_workers or os.cpu_count() or 1
+    print("\n=== Block container, %d MB in %d KB blocks (%d CPUs) ===" % (size_mb, block_size >> 10, os.cpu_count()))
+    print(" %-8s | %7s | %12s | %12s | %14s" % ("tables", "workers", "encode MB/s", "decode MB/s", "1 block read"))
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, packed, back = (os.path.join(tmp, name) for name in ("in", "in.hufb", "out"))
+        with open(src, "wb") as f:
+            f.write(sample_data(size_mb * MB))
+        counts = [1]
+        while counts[-1] * 2 <= max_workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != max_workers:
+            counts.append(max_workers)
+        for shared in (False, True):
+            for workers in counts:
+                t_enc, _ = time_call(compress_file_blocks, src, packed, block_size, workers, shared)
+                t_dec, _ = time_call(decompress_file_blocks, packed, back, workers)
+                with open(src, "rb") as a, open(back, "rb") as b:
+                    assert a.read() == b.read()
+                reader = BlockReader(packed)
+                t_one, _ = time_call(reader.read_block, len(reader) // 2)
+                print(" %-8s | %7d | %12.2f | %12.2f | %13.3fs" % (
+                    "shared" if shared else "block", workers, size_mb / t_enc, size_mb / t_dec, t_one))
+
+
+def length_limit_inputs():
+    fib = [1, 1]
+    while len(fib) < 40:
+        fib.append(fib[-1] + fib[-2])
+    yield "fibonacci x40", dict(enumerate(fib))  # deepest possible tree
+    yield "Churn csv", Counter(sample_data(MB))
+    yield "zipf 100k", dict(zipf_frequencies(10 ** 5))
+
+
+def bench_length_limits(limits=(24, 20, 16, 15, 12, 10)):
+    print("\n=== Length-limited codes: cost versus the unlimited Huffman tree ===")
+    print(" %-14s | %6s | %7s | %13s | %9s | %8s" % ("input", "limit", "longest", "bits/symbol", "extra", "time"))
+    print("-" * 72)
+    for name, counts in length_limit_inputs():
+        total = sum(counts.values())
+        base = byte_code_lengths(counts)
+        base_bits = sum(counts[s] * base[s] for s in counts)
+        print(" %-14s | %6s | %7d | %13.4f | %9s | %8s" % (
+            name, "-", max(base.values()), base_bits / total, "-", "-"))
+        for limit in limits:
+            if (len(counts) - 1).bit_length() > limit:
+                continue
+            elapsed, lengths = time_call(limited_code_lengths, counts, limit)
+            bits = sum(counts[s] * lengths[s] for s in counts)
+            print(" %-14s | %6d | %7d | %13.4f | %8.3f%% | %7.3fs" % (
+                name, limit, max(lengths.values()), bits / total, 100.0 * (bits - base_bits) / base_bits, elapsed))
+
+
+def bench_adaptive(size_kb=512):
+    print("\n=== Adaptive (one pass) vs static (two pass) Huffman, %d KB ===" % size_kb)
+    print(" %-12s | %-8s | %8s | %12s | %12s" % ("input", "coder", "ratio", "encode MB/s", "decode MB/s"))
+    print("-" * 64)
+    rng = random.Random(4)
+    inputs = [
+        ("Churn csv", sample_data(size_kb << 10)),
+        ("sales csv", sample_data(size_kb << 10, "sales_data_sample.csv")),
+        ("skewed", bytes(rng.choice(b"aaaaaaaabbbbccd") for _ in range(size_kb << 10))),
+    ]
+    size_mb = size_kb / 1024.0
+    for name, data in inputs:
+        for coder, enc, dec in (("static", compress, decompress), ("adaptive", compress_adaptive, decompress_adaptive)):
+            t_enc, blob = time_call(enc, data)
+            t_dec, back = time_call(dec, blob)
+            assert back == data
+            print(" %-12s | %-8s | %8.3f | %12.2f | %12.2f" % (
+                name, coder, len(blob) / len(data), size_mb / t_enc, size_mb / t_dec))
+
+
+def count_with_loop(data):
+    # The original per-character loop, for reference
+    freq = {}
+    for c in data:
+        if c in freq:
+            freq[c] += 1
+        else:
+            freq[c] = 1
+    return freq
+
+
+def bench_counting(size_mb=16, shard_mb=4):
+    print("\n=== Frequency counting, %d MB ===" % size_mb)
+    print(" %-26s | %10s | %10s" % ("method", "time", "MB/s"))
+    print("-" * 54)
+    data = sample_data(size_mb * MB)
+    text = data.decode("latin-1")
+    expected = count_with_loop(data)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "in")
+        with open(path, "wb") as f:
+            f.write(data)
+        runs = [
+            ("python loop", count_with_loop, data),
+            ("Counter on text", count_frequencies, text),
+            ("bincount on bytes", count_frequencies, data),
+            ("bincount on memoryview", count_frequencies, memoryview(data)),
+        ]
+        for workers in sorted({1, os.cpu_count() or 1}):
+            runs.append(("file shards, %d worker(s)" % workers,
+                         lambda p, w=workers: count_file_frequencies(p, w, shard_mb * MB), path))
+        for name, func, arg in runs:
+            elapsed, counts = time_call(func, arg)
+            assert {ord(k) if isinstance(k, str) else k: v for k, v in counts.items()} == expected
+            print(" %-26s | %9.3fs | %10.1f" % (name, elapsed, size_mb / elapsed))
+    print("\nCode-length histogram (length: symbols, occurrences):")
+    lengths = byte_code_lengths(expected)
+    for length, (symbols, occurrences) in code_length_histogram(lengths, expected).items():
+        print(" %3d: %4d symbols, %10d occurrences" % (length, symbols, occurrences))
+
+
+def traced(func, *args):
+    # (seconds, peak traced bytes, result)
+    tracemalloc.start()
+    try:
+        elapsed, result = time_call(func, *args)
+        return elapsed, tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_token_alphabets(sizes=(10 ** 4, 10 ** 5)):
+    print("\n=== Token alphabets: NodeTree objects vs flat arrays ===")
+    print(" %8s | %-9s | %10s | %12s" % ("symbols", "tree", "time", "peak MB"))
+    print("-" * 50)
+    for k in sizes:
+        freq = zipf_frequencies(k)
+        counts = [count for _, count in freq]
+        t_obj, peak_obj, root = traced(lambda: huffman_codes(build_huffman_tree(freq)))
+        t_arr, peak_arr, lengths = traced(lambda: array_code_lengths(build_huffman_arrays(counts)[2], k))
+        assert sum(c * l for c, l in zip(counts, lengths)) == sum(
+            c * root[s][1] for s, c in freq)
+        print(" %8d | %-9s | %9.3fs | %12.2f" % (k, "NodeTree", t_obj, peak_obj / MB))
+        print(" %8d | %-9s | %9.3fs | %12.2f" % (k, "arrays", t_arr, peak_arr / MB))
+    text = sample_data(MB, "sales_data_sample.csv").decode("latin-1")
+    t_enc, blob = time_call(compress_words, text)
+    t_dec, back = time_call(decompress_words, blob)
+    assert back == text
+    print("\nWord-level sales csv (1 MB): ratio %.3f (bytes %.3f), encode %.2f MB/s, decode %.2f MB/s" % (
+        len(blob) / len(text), len(compress(text.encode("latin-1"))) / len(text), 1 / t_enc, 1 / t_dec))
+    words = TOKEN_PATTERN.findall(text)
+    bigrams = list(zip(words[::2], words[1::2]))
+    blob = compress_tokens(bigrams, marshal.dumps)
+    assert decompress_tokens(blob, marshal.loads) == bigrams
+    print("Word bigrams (tuple tokens via marshal): %d tokens, %d bytes" % (len(bigrams), len(blob)))
+
+
+def recursive_code_tree(node, left=True, binString=""):
+    # The original recursive traversal, for reference
+    if not isinstance(node, NodeTree):
+        return {node: binString}
+    (l, r) = node.children()
+    d = dict()
+    d.update(recursive_code_tree(l, True, binString + "0"))
+    d.update(recursive_code_tree(r, False, binString + "1"))
+    return d
+
+
+def bench_code_tables():
+    print("\n=== Code-table generation ===")
+    print(" %-18s | %-20s | %15s" % ("tree", "method", "time"))
+    print("-" * 61)
+    fib = [1, 1]
+    while len(fib) < 3000:
+        fib.append(fib[-1] + fib[-2])
+    trees = [("zipf 100k", zipf_frequencies(10 ** 5)), ("fibonacci depth 3k", list(enumerate(fib)))]
+    for name, freq in trees:
+        root = build_huffman_tree(freq)
+        counts = [count for _, count in freq]
+        left, right, _ = build_huffman_arrays(counts)
+        methods = [
+            ("recursive strings", recursive_code_tree, (root,)),
+            ("iterative strings", huffman_code_tree, (root,)),
+            ("iterative int codes", huffman_codes, (root,)),
+            ("array int codes", array_code_table, (left, right, len(counts))),
+        ]
+        for method, func, args in methods:
+            try:
+                elapsed, _ = time_call(func, *args)
+                result = "%.3fs" % elapsed
+            except RecursionError:
+                result = "RecursionError"
+            except OverflowError:
+                result = "codes > 64 bits"
+            print(" %-18s | %-20s | %15s" % (name, method, result))
+
+
+def bench_random_access(size_mb=16, intervals=(1024, 4096, 16384, 65536), reads=200):
+    print("\n=== Random-access reads from a %d MB indexed file ===" % size_mb)
+    print(" %8s | %9s | %12s | %12s | %12s" % ("interval", "index", "1 byte", "100 bytes", "64 KB"))
+    print("-" * 66)
+    rng = random.Random(7)
+    data = sample_data(size_mb * MB)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, packed = os.path.join(tmp, "in"), os.path.join(tmp, "in.hufs")
+        with open(src, "wb") as f:
+            f.write(data)
+        plain_size = len(compress(data))
+        for interval in intervals:
+            compress_file_indexed(src, packed, interval)
+            overhead = os.path.getsize(packed) / plain_size - 1
+            latencies = []
+            with IndexedReader(packed) as reader:
+                for length in (1, 100, 64 << 10):
+                    starts = [rng.randrange(len(data) - length) for _ in range(reads)]
+                    start_time = time.perf_counter()
+                    for start in starts:
+                        reader.read(start, start + length)
+                    latencies.append((time.perf_counter() - start_time) / reads)
+                    assert reader.read(starts[0], starts[0] + length) == data[starts[0]:starts[0] + length]
+                start = starts[0]
+                assert reader[start + 100:start:-1] == data[start + 100:start:-1]
+                assert reader[start + 300:start:-3] == data[start + 300:start:-3]
+            print(" %8d | %8.2f%% | %10.0fus | %10.0fus | %10.0fus" % (
+                interval, 100 * overhead, *(t * 1e6 for t in latencies)))
+
+
+if __name__ == "__main__":
+    # Optional arguments: input sizes in MB for the codec benchmark (e.g. 1 16 1024)
+    sizes = [int(a) for a in sys.argv[1:]] or (1, 4)
+    verify_round_trips()
+    bench_builders()
+    bench_codec(sizes)
+    bench_decoders()
+    bench_stream()
+    bench_blocks()
+    bench_length_limits()
+    bench_adaptive()
+    bench_counting()
+    bench_token_alphabets()
+    bench_code_tables()
+    bench_random_access()
@@ -0,0 +1,124 @@
+import argparse
+import bz2
+import json
+import lzma
+import multiprocessing
+import os
+import platform
+import random
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import A2
+from A2_bench import peak_rss_bytes
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_FILES = ["Churn_Modelling.csv", "sales_data_sample.csv", "diabetes.csv"]
+MB = 1 << 20
+
+# codec name -> (compress, decompress)
+CODECS = {
+    "huffman": (A2.compress, A2.decompress),
+    "huffman-adaptive": (A2.compress_adaptive, A2.decompress_adaptive),
+    "zlib-6": (lambda d: zlib.compress(d, 6), zlib.decompress),
+    "bz2-9": (lambda d: bz2.compress(d, 9), bz2.decompress),
+    "lzma-6": (lambda d: lzma.compress(d, preset=6), lzma.decompress),
+}
+DEFAULT_CODECS = ["huffman", "zlib-6", "bz2-9", "lzma-6"]
+
+def run_codec(codec, path):
+    # Runs in a fresh process so peak RSS belongs to this codec and file only
+    encode, decode = CODECS[codec]
+    with open(path, "rb") as f:
+        data = f.read()
+    start = time.perf_counter()
+    blob = encode(data)
+    t_enc = time.perf_counter() - start
+    start = time.perf_counter()
+    back = decode(blob)
+    t_dec = time.perf_counter() - start
+    if back != data:
+        raise AssertionError("%s failed to round-trip %s" % (codec, path))
+    size_mb = len(data) / MB
+    return {
+        "file": os.path.basename(path),
+        "codec": codec,
+        "size": len(data),
+        "compressed": len(blob),
+        "ratio": len(blob) / len(data) if data else 1.0,
+        "encode_mb_s": size_mb / t_enc if t_enc else 0.0,
+        "decode_mb_s": size_mb / t_dec if t_dec else 0.0,
+        "peak_rss_mb": peak_rss_bytes() / MB,
+    }
+
+
+def write_synthetic(directory, size_mb):
+    # Larger inputs built from the repo data plus two extremes
+    rng = random.Random(0)
+    with open(os.path.join(HERE, "sales_data_sample.csv"), "rb") as f:
+        lines = f.read().splitlines(keepends=True)
+    paths = []
+    path = os.path.join(directory, "synthetic-csv-%dMB" % size_mb)
+    with open(path, "wb") as f:
+        written = 0
+        while written < size_mb * MB:
+            chunk = b"".join(rng.choice(lines) for _ in range(1000))
+            f.write(chunk)
+            written += len(chunk)
+    paths.append(path)
+    path = os.path.join(directory, "synthetic-skewed-%dMB" % size_mb)
+    with open(path, "wb") as f:
+        alphabet = bytes(range(32, 96))
+        weights = [0.7 ** i for i in range(len(alphabet))]
+        for _ in range(size_mb):
+            f.write(bytes(rng.choices(alphabet, weights, k=MB)))
+    paths.append(path)
+    path = os.path.join(directory, "synthetic-random-%dMB" % size_mb)
+    with open(path, "wb") as f:
+        f.write(os.urandom(size_mb * MB))
+    paths.append(path)
+    return paths
+
+
+def run_suite(paths, codecs):
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for path in paths:
+        for codec in codecs:
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                results.append(pool.submit(run_codec, codec, path).result())
+    return results
+
+
+def print_table(results):
+    print(" %-24s | %-16s | %10s | %7s | %11s | %11s | %9s" % (
+        "File", "Codec", "Bytes", "Ratio", "Enc MB/s", "Dec MB/s", "RSS MB"))
+    print("-" * 106)
+    for r in results:
+        print(" %-24s | %-16s | %10d | %7.3f | %11.2f | %11.2f | %9.1f" % (
+            r["file"], r["codec"], r["size"], r["ratio"], r["encode_mb_s"], r["decode_mb_s"], r["peak_rss_mb"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare A2.py Huffman coding with zlib, bz2 and lzma")
+    parser.add_argument("files", nargs="*", help="inputs (default: the repo CSVs plus synthetic files)")
+    parser.add_argument("--codecs", nargs="+", choices=sorted(CODECS), default=DEFAULT_CODECS)
+    parser.add_argument("--synthetic-mb", type=int, default=8, help="size of each synthetic file, 0 to skip")
+    parser.add_argument("-o", "--output", help="write the results to a JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.files
+        if not paths:
+            paths = [os.path.join(HERE, name) for name in REPO_FILES]
+            if args.synthetic_mb:
+                paths += write_synthetic(tmp, args.synthetic_mb)
+        results = run_suite(paths, args.codecs)
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+        print("\nResults written to", args.output)
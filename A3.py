@@ -1,50 +1,526 @@
+import random
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the array solvers
+    np = None
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # the LP solver falls back to a numpy simplex
+    linprog = None
+
+# Result of a solve: total value, fraction of each item taken (input order),
+# and the item indices in the order they were considered (ratio descending)
+KnapsackResult = namedtuple("KnapsackResult", ["value", "fractions", "order"])
+
+# Core greedy solver: no printing, no per-item tuples
+# trace, if given, is called as trace(index, fraction, remaining capacity)
+# after each item taken; with trace=None the loop pays one identity test.
+# Items with equal ratios are taken in input order.
+def solve_fractional_knapsack(weights, values, capacity, trace=None):
+    n = len(values)
+    ratios = [values[i] / weights[i] for i in range(n)]
+    order = sorted(range(n), key=ratios.__getitem__, reverse=True)
+    fractions = [0.0] * n
+
+    total_value = 0.0  # Total value accumulated
+    for i in order:
+        if capacity <= 0:
+            break
+        w = weights[i]
+        if capacity >= w:
+            capacity -= w
+            total_value += values[i]
+            fractions[i] = 1.0
+        else:
+            fractions[i] = capacity / w
+            total_value += values[i] * fractions[i]
+            capacity = 0
+        if trace is not None:
+            trace(i, fractions[i], capacity)
+    return KnapsackResult(total_value, fractions, order)
+
+# Solves, then prints the items, the ratio order and every take decision
 def fractional_knapsack(weights, values, capacity):
     n = len(values)
     print("Items (Value, Weight):")
     for i in range(n):
         print(f"Item {i+1}: Value = {values[i]}, Weight = {weights[i]}")
 
-    # Calculate value/weight ratio for each item
-    ratio = [(values[i] / weights[i], weights[i], values[i], i + 1) for i in range(n)]
-
-    # Sort items by ratio in descending order
-    ratio.sort(reverse=True)
+    result = solve_fractional_knapsack(weights, values, capacity)
 
     print("\nItems sorted by Value/Weight ratio (descending):")
-    for r, w, v, idx in ratio:
-        print(f"Item {idx}: Ratio = {r:.2f}, Value = {v}, Weight = {w}")
+    for i in result.order:
+        print(f"Item {i+1}: Ratio = {values[i] / weights[i]:.2f}, Value = {values[i]}, Weight = {weights[i]}")
 
-    total_value = 0.0  # Total value accumulated
     print("\nProcessing items:")
-    for r, w, v, idx in ratio:
-        if capacity == 0:
+    for i in result.order:
+        fraction = result.fractions[i]
+        if fraction == 0:
             break
 
-        if capacity >= w:
-            capacity -= w
-            total_value += v
-            print(f"-> Took entire Item {idx} (Weight {w}, Value {v})")
+        w, v = weights[i], values[i]
+        if fraction == 1.0:
+            print(f"-> Took entire Item {i+1} (Weight {w}, Value {v})")
         else:
-            fraction = capacity / w
-            total_value += v * fraction
             print(
-                f"-> Took {fraction*100:.1f}% of Item {idx} (Weight {capacity:.2f}, Value {v * fraction:.2f})"
+                f"-> Took {fraction*100:.1f}% of Item {i+1} (Weight {w * fraction:.2f}, Value {v * fraction:.2f})"
             )
-            capacity = 0
 
-    print(f"\n>> Maximum value in Knapsack = {total_value:.2f}")
+    print(f"\n>> Maximum value in Knapsack = {result.value:.2f}")
+    return result.value
+
+
+# Vectorized solver for large item sets (numpy arrays, no printing)
+# Items are ordered by ratio with one argsort; the running weight total then
+# gives the cut point with a single searchsorted: every item before it fits
+# entirely, the item at the cut is taken fractionally, the rest not at all.
+# Returns (total value, fraction of each item taken, in input order).
+def fractional_knapsack_np(weights, values, capacity):
+    if np is None:
+        raise ImportError("fractional_knapsack_np requires numpy")
+    weights = np.asarray(weights, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    fractions = np.zeros(len(values))
+    if capacity <= 0 or len(values) == 0:
+        return 0.0, fractions
+
+    order = np.argsort(-(values / weights), kind="stable")
+    return float(fill_in_order(order, weights, values, capacity, fractions)), fractions
+
+# Takes the items of order (index array) whole while they fit, then a fraction
+# of the next one; writes fractions and returns the value taken
+def fill_in_order(order, weights, values, capacity, fractions):
+    filled = np.cumsum(weights[order])
+    k = int(np.searchsorted(filled, capacity, side="right"))  # items taken whole
+    whole = order[:k]
+    fractions[whole] = 1.0
+    total_value = values[whole].sum()
+    if k < len(order):
+        cut = order[k]
+        fractions[cut] = (capacity - (filled[k - 1] if k else 0.0)) / weights[cut]
+        total_value += values[cut] * fractions[cut]
     return total_value
 
 
-# Example input
-values = [60, 100, 120]
-weights = [10, 20, 30]
-capacity = 50
-
-print("=== Fractional Knapsack Problem ===")
-print(f"Knapsack Capacity = {capacity}\n")
-
-fractional_knapsack(weights, values, capacity)
+# Selection solver, expected O(n): no full sort
+# Only the break item's ratio matters. Each round splits the undecided items
+# around a random pivot ratio: if the items above it overflow the capacity
+# the break item is among them, otherwise they are all taken (and the pivot's
+# ties after them) and the search continues below the pivot. Each round
+# keeps an expected constant fraction of the items, so the total work is
+# linear; the last SELECT_CUTOFF items are simply sorted. Same result as
+# fractional_knapsack_np (ties filled in input order).
+SELECT_CUTOFF = 2048
+
+def fractional_knapsack_select(weights, values, capacity, seed=None):
+    if np is None:
+        raise ImportError("fractional_knapsack_select requires numpy")
+    weights = np.asarray(weights, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    fractions = np.zeros(len(values))
+    if capacity <= 0 or len(values) == 0:
+        return 0.0, fractions
+
+    rng = np.random.default_rng(seed)
+    ratios = values / weights
+    active = np.arange(len(values))
+    total_value = 0.0
+    while len(active):
+        r = ratios[active]
+        if len(active) <= SELECT_CUTOFF:
+            order = active[np.argsort(-r, kind="stable")]
+            total_value += fill_in_order(order, weights, values, capacity, fractions)
+            break
+        pivot = r[rng.integers(len(r))]
+        above = active[r > pivot]
+        above_weight = weights[above].sum()
+        if above_weight > capacity:
+            active = above
+            continue
+        fractions[above] = 1.0
+        total_value += values[above].sum()
+        capacity -= above_weight
+
+        tied = active[r == pivot]
+        tied_weight = weights[tied].sum()
+        if tied_weight >= capacity:
+            total_value += fill_in_order(tied, weights, values, capacity, fractions)
+            break
+        fractions[tied] = 1.0
+        total_value += values[tied].sum()
+        capacity -= tied_weight
+        active = active[r < pivot]
+    return float(total_value), fractions
+
+
+# One item set, many capacities
+# Sorts once and keeps the running weight and value totals in ratio order
+# (with a leading 0). For a capacity c, searchsorted finds the last prefix
+# that fits, and the optimum is that prefix's value plus the leftover
+# capacity times the next item's ratio: O(log n) per capacity.
+class BatchKnapsack(object):
+    def __init__(self, weights, values):
+        if np is None:
+            raise ImportError("BatchKnapsack requires numpy")
+        weights = np.asarray(weights, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        ratios = values / weights
+        self.order = np.argsort(-ratios, kind="stable")
+        self.filled = np.concatenate(([0.0], np.cumsum(weights[self.order])))
+        self.gained = np.concatenate(([0.0], np.cumsum(values[self.order])))
+        # ratio of the item after each prefix; 0 past the last item
+        self.next_ratio = np.append(ratios[self.order], 0.0)
+
+    def __len__(self):
+        return len(self.order)
+
+    # Optimal values for a scalar or an array of capacities (same shape)
+    def solve(self, capacities):
+        capacities = np.maximum(np.asarray(capacities, dtype=np.float64), 0.0)
+        k = np.searchsorted(self.filled, capacities, side="right") - 1
+        return self.gained[k] + (capacities - self.filled[k]) * self.next_ratio[k]
+
+def fractional_knapsack_batch(weights, values, capacities):
+    return BatchKnapsack(weights, values).solve(capacities)
+
+
+# Changing item sets: a treap (randomized balanced search tree) of items in
+# ratio order, each node holding the weight and value totals of its subtree.
+# Insert, delete and update rebalance with split/merge in expected O(log n);
+# solve(capacity) walks down once, taking whole left subtrees while they
+# fit, so any capacity is answered in O(log n) as well.
+class KnapsackNode(object):
+    def __init__(self, key, weight, value, seq):
+        self.key = key
+        self.weight = weight
+        self.value = value
+        self.ratio = value / weight
+        self.seq = seq  # insertion order, breaks ratio ties
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.total_weight = weight
+        self.total_value = value
+
+    # True if this item is taken before other (higher ratio, or tied and older)
+    def before(self, other):
+        return self.ratio > other.ratio or (self.ratio == other.ratio and self.seq < other.seq)
+
+    def pull(self):
+        self.total_weight = self.weight
+        self.total_value = self.value
+        for child in (self.left, self.right):
+            if child is not None:
+                self.total_weight += child.total_weight
+                self.total_value += child.total_value
+
+# (nodes before node, the rest)
+def split_tree(root, node):
+    if root is None:
+        return None, None
+    if root.before(node):
+        root.right, right = split_tree(root.right, node)
+        root.pull()
+        return root, right
+    left, root.left = split_tree(root.left, node)
+    root.pull()
+    return left, root
+
+# Joins two treaps where every node of left comes before every node of right
+def merge_trees(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge_trees(left.right, right)
+        left.pull()
+        return left
+    right.left = merge_trees(left, right.left)
+    right.pull()
+    return right
+
+def remove_node(root, node):
+    if root is node:
+        return merge_trees(root.left, root.right)
+    if node.before(root):
+        root.left = remove_node(root.left, node)
+    else:
+        root.right = remove_node(root.right, node)
+    root.pull()
+    return root
+
+class DynamicKnapsack(object):
+    def __init__(self, items=()):
+        self.root = None
+        self.nodes = {}  # key -> node
+        self.seq = 0
+        self.build(items)
+
+    # Initial items in O(n log n): one sort, then a linear Cartesian-tree pass
+    # (a stack of the rightmost path, popping nodes with lower priority; a
+    # node's subtree is final once it is popped, so totals are pulled then)
+    # All items are validated before any is added, so a bad batch changes nothing.
+    def build(self, items):
+        items = list(items)
+        keys = set()
+        for key, weight, value in items:
+            if key in self.nodes or key in keys:
+                raise KeyError("item %r already present" % (key,))
+            if weight <= 0:
+                raise ValueError("weight must be positive")
+            keys.add(key)
+        nodes = []
+        for key, weight, value in items:
+            node = KnapsackNode(key, weight, value, self.seq)
+            self.seq += 1
+            self.nodes[key] = node
+            nodes.append(node)
+        if self.root is not None:
+            for node in nodes:
+                left, right = split_tree(self.root, node)
+                self.root = merge_trees(merge_trees(left, node), right)
+            return
+        nodes.sort(key=lambda node: -node.ratio)  # stable: ties keep insertion order
+        stack = []
+        for node in nodes:
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+                last.pull()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        last = None
+        while stack:
+            last = stack.pop()
+            last.pull()
+        self.root = last
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def insert(self, key, weight, value):
+        self.build([(key, weight, value)])
+
+    def delete(self, key):
+        self.root = remove_node(self.root, self.nodes.pop(key))
+
+    def update(self, key, weight, value):
+        self.delete(key)
+        self.insert(key, weight, value)
+
+    # Total weight of all items (the capacity beyond which every item fits)
+    def total_weight(self):
+        return self.root.total_weight if self.root is not None else 0
+
+    def solve(self, capacity):
+        total_value = 0.0
+        node = self.root
+        while node is not None and capacity > 0:
+            left = node.left
+            if left is not None:
+                if capacity < left.total_weight:
+                    node = left
+                    continue
+                total_value += left.total_value
+                capacity -= left.total_weight
+            if capacity < node.weight:
+                return total_value + node.value * capacity / node.weight
+            total_value += node.value
+            capacity -= node.weight
+            node = node.right
+        return total_value
+
+
+# Several capacity constraints at once (weight, volume, ...)
+# The continuous knapsack with m constraints is the LP
+#     maximize values . x  subject to  weights @ x <= capacities,  0 <= x <= 1
+# with weights an (m, n) array, one row per constraint (a 1-D weights array
+# is the single-constraint problem above). scipy's HiGHS solves it when
+# scipy is installed; otherwise lp_knapsack_numpy below does.
+# Returns (total value, fraction of each item taken).
+def fractional_knapsack_lp(weights, values, capacities, method=None):
+    if np is None:
+        raise ImportError("fractional_knapsack_lp requires numpy")
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    values = np.asarray(values, dtype=np.float64)
+    capacities = np.atleast_1d(np.asarray(capacities, dtype=np.float64))
+    if weights.shape != (len(capacities), len(values)):
+        raise ValueError("weights must have one row per capacity and one column per item")
+    if (capacities < 0).any() or (weights < 0).any():
+        raise ValueError("weights and capacities must be non-negative")
+    if method is None:
+        method = "numpy" if linprog is None else "scipy"
+    if method == "scipy":
+        if linprog is None:
+            raise ImportError("method='scipy' requires scipy")
+        res = linprog(-values, A_ub=weights, b_ub=capacities, bounds=(0, 1), method="highs")
+        if res.status != 0:
+            raise RuntimeError(res.message)
+        return float(-res.fun), res.x
+    if method != "numpy":
+        raise ValueError("method must be 'scipy' or 'numpy'")
+    fractions, _ = lp_knapsack_numpy(weights, values, capacities)
+    return float(values @ fractions), fractions
+
+# Bounded-variable primal simplex for the LP above, for small n
+# Columns are the n items plus m slacks; nonbasic items sit at 0 or at their
+# upper bound 1, so the x <= 1 bounds need no rows of their own and the basis
+# stays m x m. start optionally marks items to begin at 1 (the start must be
+# feasible). Dantzig pricing, falling back to Bland's rule on long runs of
+# degenerate steps so it cannot cycle: the lowest-index improving variable
+# enters and ratio-test ties leave by lowest variable index. Returns (x, duals).
+SIMPLEX_MAX_ITER = 10 ** 6
+
+def bounded_simplex(A, c, b, start=None):
+    m, n = A.shape
+    full = np.hstack((A, np.eye(m)))
+    cost = np.concatenate((c, np.zeros(m)))
+    upper = np.zeros(n + m, dtype=bool)
+    if start is not None:
+        upper[:n] = start
+    basis = np.arange(n, n + m)
+    tol = 1e-9 * max(1.0, np.abs(c).max(initial=0.0))
+    degenerate = 0
+    for _ in range(SIMPLEX_MAX_ITER):
+        binv = np.linalg.inv(full[:, basis])
+        rhs = b - A[:, upper[:n]].sum(axis=1)
+        xb = binv @ rhs
+        duals = cost[basis] @ binv
+        reduced = cost - duals @ full
+        score = np.where(upper, -reduced, reduced)
+        score[basis] = 0.0
+        bland = degenerate > 50
+        if bland:
+            eligible = np.flatnonzero(score > tol)
+            j = eligible[0] if len(eligible) else 0
+        else:
+            j = int(np.argmax(score))
+        if score[j] <= tol:
+            x = upper[:n].astype(np.float64)
+            structural = basis < n
+            x[basis[structural]] = xb[structural]
+            return np.clip(x, 0.0, 1.0), duals
+
+        # Entering j moves by step * direction; basic k changes by -direction * alpha[k]
+        direction = -1.0 if upper[j] else 1.0
+        change = -direction * (binv @ full[:, j])
+        step = 1.0 if j < n else np.inf
+        leave, leave_upper = -1, False
+        for k in range(m):
+            if change[k] < -1e-12:
+                limit = xb[k] / -change[k]
+                at_upper = False
+            elif change[k] > 1e-12 and basis[k] < n:
+                limit = (1.0 - xb[k]) / change[k]
+                at_upper = True
+            else:
+                continue
+            limit = max(limit, 0.0)
+            if limit < step or (bland and leave >= 0 and limit <= step + 1e-12 and basis[k] < basis[leave]):
+                step, leave, leave_upper = min(limit, step), k, at_upper
+        if step == np.inf:
+            raise RuntimeError("LP is unbounded")
+        degenerate = degenerate + 1 if step <= 1e-12 else 0
+        if leave < 0:
+            upper[j] = not upper[j]  # bound flip, basis unchanged
+        else:
+            upper[basis[leave]] = leave_upper
+            upper[j] = False
+            basis[leave] = j
+    raise RuntimeError("simplex did not converge in %d iterations" % SIMPLEX_MAX_ITER)
+
+# Number of leading items of order (item indices, non-negative weights)
+# that fit together under every capacity
+def fitting_prefix(A, b, order):
+    fits = (np.cumsum(A[:, order], axis=1) <= b[:, None]).all(axis=0)
+    return len(fits) if fits.all() else int(np.argmin(fits))
+
+# Items taken at 1 in descending score order (positive scores only) while
+# every constraint still holds: a feasible starting vertex near the optimum
+def greedy_start(A, b, score):
+    order = np.argsort(-score, kind="stable")
+    order = order[score[order] > 0]
+    start = np.zeros(len(score), dtype=bool)
+    start[order[:fitting_prefix(A, b, order)]] = True
+    return start
+
+# Pure-numpy LP solve by sifting (working sets)
+# At the optimum only items whose reduced cost v_i - y . a_i is zero can be
+# fractional; the others sit at 1 (positive) or 0 (negative). Dual prices y
+# come from the same problem on a random eighth of the items (capacities
+# scaled to match), solved recursively, so they are already close. Then only
+# the working_set items with reduced cost nearest zero go to the simplex and
+# the rest are fixed by sign (the set grows if the fixed items overflow a
+# capacity). The sub-LP's duals are checked against every fixed item: if
+# none has a reduced cost of the wrong sign the solution is optimal for the
+# whole problem (the KKT conditions hold); otherwise the offenders join the
+# working set and the sub-LP is solved again. Returns (x, duals).
+WORKING_SET = 2048
+
+def lp_knapsack_numpy(A, c, b, working_set=WORKING_SET, seed=0):
+    m, n = A.shape
+    if n <= working_set:
+        # normalized size of each item: its share of every capacity
+        size = (A / np.maximum(b, 1e-300)[:, None]).sum(axis=0)
+        return bounded_simplex(A, c, b, greedy_start(A, b, c / np.maximum(size, 1e-300)))
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(n, max(working_set, n // 8), replace=False)
+    _, duals = lp_knapsack_numpy(A[:, sample], c[sample], b * (len(sample) / n), working_set, seed + 1)
+
+    tol = 1e-9 * max(1.0, np.abs(c).max())
+    reduced = c - duals @ A
+    nearest = np.argsort(np.abs(reduced))
+    active = np.zeros(n, dtype=bool)
+    k = working_set
+    while True:
+        active[nearest[:k]] = True
+        fixed_one = (reduced > 0) & ~active
+        rest = b - A[:, fixed_one].sum(axis=1)
+        while (rest < 0).any():
+            k *= 2
+            active[nearest[:k]] = True
+            fixed_one &= ~active
+            rest = b - A[:, fixed_one].sum(axis=1)
+
+        items = np.flatnonzero(active)
+        sub_start = greedy_start(A[:, items], rest, reduced[items])
+        sub_x, sub_duals = bounded_simplex(A[:, items], c[items], rest, sub_start)
+
+        sub_reduced = c - sub_duals @ A
+        wrong = ~active & np.where(fixed_one, sub_reduced < -tol, sub_reduced > tol)
+        if not wrong.any():
+            x = fixed_one.astype(np.float64)
+            x[items] = sub_x
+            return x, sub_duals
+        if wrong.sum() > k:
+            # the working set missed where the optimum's cut lies (its duals
+            # are far off): widen it around the same prices instead
+            k *= 2
+            continue
+        active |= wrong
+        duals, reduced = sub_duals, sub_reduced
+        nearest = np.argsort(np.abs(reduced))
+
+if __name__ == "__main__":
+    # Example input
+    values = [60, 100, 120]
+    weights = [10, 20, 30]
+    capacity = 50
+
+    print("=== Fractional Knapsack Problem ===")
+    print(f"Knapsack Capacity = {capacity}\n")
+
+    fractional_knapsack(weights, values, capacity)
 
 
 
@@ -0,0 +1,208 @@
+import contextlib
+import os
+import time
+
+import numpy as np
+
+from A3 import (
+    fractional_knapsack,
+    solve_fractional_knapsack,
+    fractional_knapsack_np,
+    fractional_knapsack_select,
+    BatchKnapsack,
+    DynamicKnapsack,
+    fractional_knapsack_lp,
+    lp_knapsack_numpy,
+    linprog,
+)
+
+# Largest item count the printing solver is timed at (it writes three lines
+# per item, even with stdout sent to /dev/null)
+PRINTING_LIMIT = 10 ** 5
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def fmt(seconds):
+    if seconds is None:
+        return "-"
+    return "%.6fs" % seconds
+
+
+# n random items (weights in [1, 100), values in [1, 1000)) and a capacity
+# of about a third of their total weight
+def random_items(n, seed=0):
+    rng = np.random.default_rng(seed)
+    weights = rng.uniform(1, 100, n)
+    values = rng.uniform(1, 1000, n)
+    return weights, values, float(weights.sum()) / 3
+
+
+def quiet(func, *args):
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return func(*args)
+
+
+def bench_vectorized(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)):
+    print("=== Fractional knapsack: printing solver vs numpy ===")
+    print(" %10s | %12s | %12s | %9s" % ("items", "printing", "numpy", "speedup"))
+    print("-" * 54)
+    for n in sizes:
+        weights, values, capacity = random_items(n)
+        t_np, (expected, fractions) = time_call(fractional_knapsack_np, weights, values, capacity)
+        assert np.dot(fractions, weights) <= capacity * (1 + 1e-9)
+        t_orig = None
+        if n <= PRINTING_LIMIT:
+            t_orig, value = time_call(quiet, fractional_knapsack, weights.tolist(), values.tolist(), capacity)
+            assert abs(value - expected) <= 1e-9 * expected
+        speedup = "%8.1fx" % (t_orig / t_np) if t_orig else "-"
+        print(" %10d | %12s | %12s | %9s" % (n, fmt(t_orig), fmt(t_np), speedup))
+
+
+# Best of a few runs, so the randomized pivots and the sort are compared fairly
+def best_of(repeats, func, *args):
+    return min(time_call(func, *args)[0] for _ in range(repeats))
+
+
+def bench_selection(sizes=(10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7), fills=(0.01, 0.33, 0.9)):
+    print("\n=== Fractional knapsack: argsort vs expected-O(n) selection ===")
+    print(" %10s | %6s | %12s | %12s | %9s" % ("items", "fill", "argsort", "select", "speedup"))
+    print("-" * 63)
+    for n in sizes:
+        weights, values, _ = random_items(n)
+        repeats = 5 if n <= 10 ** 6 else 1
+        for fill in fills:
+            capacity = float(weights.sum()) * fill
+            expected, fractions = fractional_knapsack_np(weights, values, capacity)
+            value, chosen = fractional_knapsack_select(weights, values, capacity)
+            assert abs(value - expected) <= 1e-9 * expected and np.allclose(chosen, fractions)
+            t_sort = best_of(repeats, fractional_knapsack_np, weights, values, capacity)
+            t_select = best_of(repeats, fractional_knapsack_select, weights, values, capacity)
+            print(" %10d | %6.2f | %12s | %12s | %8.1fx" % (n, fill, fmt(t_sort), fmt(t_select), t_sort / t_select))
+
+
+def bench_batch(items=10 ** 6, capacity_counts=(1, 100, 10 ** 4, 10 ** 6), per_call_limit=20):
+    print("\n=== %d items against many capacities: one solve per capacity vs BatchKnapsack ===" % items)
+    print(" %10s | %14s | %12s | %12s | %12s" % ("capacities", "one by one", "batch build", "batch solve", "per query"))
+    print("-" * 74)
+    weights, values, _ = random_items(items)
+    rng = np.random.default_rng(1)
+    t_build, batch = time_call(BatchKnapsack, weights, values)
+    for count in capacity_counts:
+        capacities = rng.uniform(0, weights.sum(), count)
+        t_solve, result = time_call(batch.solve, capacities)
+        # Solving each capacity separately, timed on a few and scaled up
+        sample = capacities[:per_call_limit]
+        start = time.perf_counter()
+        for c, expected in zip(sample, result):
+            value, _ = fractional_knapsack_np(weights, values, c)
+            assert abs(value - expected) <= 1e-9 * max(expected, 1.0)
+        t_calls = (time.perf_counter() - start) * count / len(sample)
+        print(" %10d | %13.4fs | %12s | %12s | %10.3fus" % (
+            count, t_calls, fmt(t_build), fmt(t_solve), t_solve / count * 1e6))
+    print("(one by one: fractional_knapsack_np per capacity, extrapolated from %d calls)" % per_call_limit)
+
+
+def bench_dynamic(sizes=(10 ** 4, 10 ** 5, 10 ** 6), ops=10 ** 4):
+    print("\n=== Changing item sets: DynamicKnapsack vs re-solving with numpy ===")
+    print(" %9s | %10s | %10s | %10s | %10s | %10s | %12s" % (
+        "items", "build", "insert", "delete", "update", "solve", "numpy solve"))
+    print("-" * 88)
+    rng = np.random.default_rng(2)
+    for n in sizes:
+        weights, values, capacity = random_items(n)
+        start = time.perf_counter()
+        knapsack = DynamicKnapsack(zip(range(n), weights.tolist(), values.tolist()))
+        t_build = time.perf_counter() - start
+
+        new_weights, new_values, _ = random_items(ops, seed=3)
+        keys = rng.choice(n, ops, replace=False).tolist()
+        per_op = []
+        start = time.perf_counter()
+        for i in range(ops):
+            knapsack.insert(n + i, new_weights[i], new_values[i])
+        per_op.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for key in keys:
+            knapsack.delete(key)
+        per_op.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for i, key in enumerate(range(n, n + ops)):
+            knapsack.update(key, new_weights[i], new_values[-i - 1])
+        per_op.append(time.perf_counter() - start)
+        capacities = rng.uniform(0, knapsack.total_weight(), ops).tolist()
+        start = time.perf_counter()
+        for c in capacities:
+            knapsack.solve(c)
+        per_op.append(time.perf_counter() - start)
+
+        # Same item set solved from scratch
+        kept = np.ones(n, dtype=bool)
+        kept[keys] = False
+        all_weights = np.concatenate((weights[kept], new_weights))
+        all_values = np.concatenate((values[kept], new_values[::-1]))
+        t_np, (expected, _) = time_call(fractional_knapsack_np, all_weights, all_values, capacity)
+        assert abs(knapsack.solve(capacity) - expected) <= 1e-9 * expected
+        print(" %9d | %9.3fs | %8.2fus | %8.2fus | %8.2fus | %8.2fus | %12s" % (
+            n, t_build, *(t / ops * 1e6 for t in per_op), fmt(t_np)))
+
+
+def bench_quiet(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)):
+    print("\n=== Printing solver vs quiet core solver (pure Python lists) ===")
+    print(" %10s | %12s | %12s | %12s | %12s" % ("items", "printing", "quiet", "no-op trace", "numpy"))
+    print("-" * 70)
+    for n in sizes:
+        weights, values, capacity = random_items(n)
+        weight_list, value_list = weights.tolist(), values.tolist()
+        t_quiet, result = time_call(solve_fractional_knapsack, weight_list, value_list, capacity)
+        t_trace, _ = time_call(solve_fractional_knapsack, weight_list, value_list, capacity, lambda i, f, c: None)
+        t_np, (expected, _) = time_call(fractional_knapsack_np, weights, values, capacity)
+        assert abs(result.value - expected) <= 1e-9 * expected
+        t_print = None
+        if n <= PRINTING_LIMIT:
+            t_print, _ = time_call(quiet, fractional_knapsack, weight_list, value_list, capacity)
+        print(" %10d | %12s | %12s | %12s | %12s" % (n, fmt(t_print), fmt(t_quiet), fmt(t_trace), fmt(t_np)))
+
+
+# Strong-duality gap of an LP solution, relative (0 when optimal):
+# capacities . y + sum(max(0, v - y A)) bounds the optimum from above
+def duality_gap(weights, values, capacities, fractions, duals):
+    value = values @ fractions
+    bound = capacities @ duals + np.maximum(0, values - duals @ weights).sum()
+    return (bound - value) / value
+
+
+def bench_multi_constraint(sizes=(10 ** 4, 10 ** 5, 10 ** 6), constraints=(2, 3, 5)):
+    print("\n=== Multi-constraint fractional knapsack (LP) ===")
+    print(" %9s | %4s | %12s | %12s | %10s | %10s" % ("items", "m", "numpy", "scipy", "fractional", "gap"))
+    print("-" * 72)
+    rng = np.random.default_rng(4)
+    for n in sizes:
+        for m in constraints:
+            weights = rng.uniform(1, 100, (m, n))
+            values = rng.uniform(1, 1000, n)
+            capacities = weights.sum(axis=1) * rng.uniform(0.1, 0.5, m)
+            t_np, (fractions, duals) = time_call(lp_knapsack_numpy, weights, values, capacities)
+            value = values @ fractions
+            assert (weights @ fractions <= capacities * (1 + 1e-9)).all()
+            t_scipy = None
+            if linprog is not None:
+                t_scipy, (expected, _) = time_call(fractional_knapsack_lp, weights, values, capacities, "scipy")
+                assert abs(value - expected) <= 1e-6 * expected
+            gap = duality_gap(weights, values, capacities, fractions, duals)
+            partial = int(((fractions > 0) & (fractions < 1)).sum())
+            print(" %9d | %4d | %12s | %12s | %10d | %10s" % (
+                n, m, fmt(t_np), fmt(t_scipy), partial, "%.1e" % gap))
+
+
+if __name__ == "__main__":
+    bench_vectorized()
+    bench_quiet()
+    bench_selection()
+    bench_batch()
+    bench_dynamic()
+    bench_multi_constraint()